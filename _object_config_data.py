@@ -0,0 +1,91 @@
+# _object_config_data.py
+# Generated by gen_object_config.py from object_config.json - do not edit.
+
+# One row per class, declared in COCO class-ID order (0..79) so the integer
+# class id produced by YOLO indexes the object_config tables directly.
+# Only literals here: the compiler folds the whole table into a single
+# constant that loads straight from the .pyc.
+# (name, color, task, prompt, llm_query, category, is_analyzable)
+
+_DATA = (
+    ('person', '#00FF00', '<DETAILED_CAPTION>', 'Identify this person.', 'Identify this person. Provide name or physical description.', 'Humans', True),
+    ('bicycle', '#FF6B00', '<VQA>', 'What type of bicycle is this?', 'Identify the type and notable features of this bicycle.', 'Vehicles', True),
+    ('car', '#FF6B00', '<VQA>', 'What is the make and model of this car?', 'Identify manufacturer, model, and estimated year.', 'Vehicles', True),
+    ('motorcycle', '#FF6B00', '<VQA>', 'What make and model is this motorcycle?', 'Identify manufacturer and model of this motorcycle.', 'Vehicles', True),
+    ('airplane', '#FF6B00', '<VQA>', 'What kind of aircraft is this?', 'Identify the aircraft model and airline if visible.', 'Vehicles', True),
+    ('bus', '#FF6B00', '<VQA>', 'What type of bus is this?', 'Identify the bus type and any company branding.', 'Vehicles', True),
+    ('train', '#FF6B00', '<VQA>', 'What type of train or locomotive is this?', 'Identify the train type and operator.', 'Vehicles', True),
+    ('truck', '#FF6B00', '<VQA>', 'What is the make and model of this truck?', 'Identify the truck manufacturer and configuration.', 'Vehicles', True),
+    ('boat', '#FF6B00', '<VQA>', 'What kind of boat or ship is this?', 'Identify the vessel type and name if visible.', 'Vehicles', True),
+    ('traffic light', '#FF0000', '<VQA>', 'What color is the traffic light?', 'Identify traffic light status.', 'Outdoors', False),
+    ('fire hydrant', '#FF0000', '<DETAILED_CAPTION>', 'Describe the hydrant.', 'Describe fire hydrant.', 'Outdoors', False),
+    ('stop sign', '#FF0000', '<DETAILED_CAPTION>', 'Identify the sign.', 'Confirm stop sign status.', 'Outdoors', False),
+    ('parking meter', '#AAAAAA', '<DETAILED_CAPTION>', 'Describe the meter.', 'Describe parking meter.', 'Outdoors', False),
+    ('bench', '#8B4513', '<DETAILED_CAPTION>', 'Describe the bench.', 'Describe bench style.', 'Outdoors', False),
+    ('bird', '#FF00FF', '<VQA>', 'What species of bird is this?', 'Identify the bird species and notable plumage details.', 'Animals', True),
+    ('cat', '#FF00FF', '<VQA>', 'What breed is this cat?', 'Identify the cat breed and coat patterns.', 'Animals', True),
+    ('dog', '#FF00FF', '<VQA>', 'What breed is this dog?', 'Identify the dog breed and size.', 'Animals', True),
+    ('horse', '#FF00FF', '<VQA>', 'What breed of horse is this?', 'Identify the horse breed and color.', 'Animals', True),
+    ('sheep', '#FF00FF', '<DETAILED_CAPTION>', 'Describe this sheep.', "Describe the sheep's condition and environment.", 'Animals', False),
+    ('cow', '#FF00FF', '<VQA>', 'What breed of cattle is this?', 'Identify the cattle breed.', 'Animals', False),
+    ('elephant', '#FF00FF', '<VQA>', 'Is this an African or Asian elephant?', 'Identify the elephant species.', 'Animals', True),
+    ('bear', '#FF00FF', '<VQA>', 'What kind of bear is this?', 'Identify the bear species (Grizzly, Black, Polar, etc).', 'Animals', True),
+    ('zebra', '#FF00FF', '<DETAILED_CAPTION>', 'Describe this zebra.', "Describe the zebra's appearance.", 'Animals', False),
+    ('giraffe', '#FF00FF', '<DETAILED_CAPTION>', 'Describe this giraffe.', "Describe the giraffe's appearance.", 'Animals', False),
+    ('backpack', '#FFFF00', '<VQA>', 'What brand is this backpack?', 'Identify backpack brand/type.', 'Accessories', True),
+    ('umbrella', '#00FFFF', '<DETAILED_CAPTION>', 'Describe the umbrella.', 'Describe umbrella.', 'Accessories', False),
+    ('handbag', '#FFFF00', '<VQA>', 'What brand is this handbag?', 'Identify handbag brand.', 'Accessories', True),
+    ('tie', '#FFFF00', '<DETAILED_CAPTION>', 'Describe the tie.', 'Describe tie pattern.', 'Accessories', False),
+    ('suitcase', '#FFFF00', '<VQA>', 'What brand is this suitcase?', 'Identify suitcase brand.', 'Accessories', True),
+    ('frisbee', '#00FFFF', '<DETAILED_CAPTION>', 'Describe the frisbee.', 'Describe frisbee.', 'Sports', False),
+    ('skis', '#00FFFF', '<VQA>', 'What brand are these skis?', 'Identify skis brand.', 'Sports', True),
+    ('snowboard', '#00FFFF', '<VQA>', 'What brand is this snowboard?', 'Identify snowboard brand.', 'Sports', True),
+    ('sports ball', '#00FFFF', '<VQA>', 'What kind of ball is this?', 'Identify the sport for this ball.', 'Sports', True),
+    ('kite', '#00FFFF', '<DETAILED_CAPTION>', 'Describe the kite.', 'Describe kite.', 'Sports', False),
+    ('baseball bat', '#00FFFF', '<DETAILED_CAPTION>', 'Describe the bat.', 'Describe bat.', 'Sports', False),
+    ('baseball glove', '#00FFFF', '<DETAILED_CAPTION>', 'Describe the glove.', 'Describe glove.', 'Sports', False),
+    ('skateboard', '#00FFFF', '<VQA>', 'What is on the graphic of this skateboard?', 'Describe skateboard graphic.', 'Sports', True),
+    ('surfboard', '#00FFFF', '<VQA>', 'What brand is this surfboard?', 'Identify surfboard brand.', 'Sports', True),
+    ('tennis racket', '#00FFFF', '<VQA>', 'What brand is this racket?', 'Identify racket brand.', 'Sports', True),
+    ('bottle', '#FF4444', '<VQA>', 'What is in this bottle?', 'Identify bottle content/brand.', 'Household', True),
+    ('wine glass', '#FF4444', '<DETAILED_CAPTION>', 'Describe the glass.', 'Describe wine glass.', 'Household', False),
+    ('cup', '#FF4444', '<VQA>', 'What brand or logo is on this cup?', 'Identify cup branding.', 'Household', True),
+    ('fork', '#FF4444', '<DETAILED_CAPTION>', 'Describe the fork.', 'Describe fork.', 'Household', False),
+    ('knife', '#FF4444', '<DETAILED_CAPTION>', 'Describe the knife.', 'Describe knife.', 'Household', False),
+    ('spoon', '#FF4444', '<DETAILED_CAPTION>', 'Describe the spoon.', 'Describe spoon.', 'Household', False),
+    ('bowl', '#FF4444', '<VQA>', 'What is in this bowl?', 'Identify bowl contents.', 'Household', True),
+    ('banana', '#CCFF00', '<DETAILED_CAPTION>', 'Describe the banana.', 'Describe banana ripeness.', 'Food', False),
+    ('apple', '#CCFF00', '<VQA>', 'What type of apple is this?', 'Identify apple variety.', 'Food', True),
+    ('sandwich', '#CCFF00', '<VQA>', 'What kind of sandwich is this?', 'Identify sandwich type/ingredients.', 'Food', True),
+    ('orange', '#CCFF00', '<VQA>', 'Is this an orange or a tangerine?', 'Identify citrus type.', 'Food', False),
+    ('broccoli', '#CCFF00', '<DETAILED_CAPTION>', 'Describe the broccoli.', 'Describe broccoli.', 'Food', False),
+    ('carrot', '#CCFF00', '<DETAILED_CAPTION>', 'Describe the carrot.', 'Describe carrot.', 'Food', False),
+    ('hot dog', '#CCFF00', '<VQA>', 'What toppings are on this hot dog?', 'Describe hot dog toppings.', 'Food', True),
+    ('pizza', '#CCFF00', '<VQA>', 'What toppings are on this pizza?', 'Identify pizza toppings.', 'Food', True),
+    ('donut', '#CCFF00', '<VQA>', 'What kind of donut is this?', 'Identify donut type.', 'Food', True),
+    ('cake', '#CCFF00', '<VQA>', 'What kind of cake is this?', 'Identify cake type.', 'Food', True),
+    ('chair', '#8B4513', '<DETAILED_CAPTION>', 'Describe the chair.', 'Describe chair style.', 'Household', True),
+    ('couch', '#8B4513', '<DETAILED_CAPTION>', 'Describe the couch.', 'Describe couch style.', 'Household', True),
+    ('potted plant', '#228B22', '<VQA>', 'What species of plant is this?', 'Identify plant species.', 'Outdoors', True),
+    ('bed', '#8B4513', '<DETAILED_CAPTION>', 'Describe the bed.', 'Describe bed type.', 'Household', False),
+    ('dining table', '#8B4513', '<DETAILED_CAPTION>', 'Describe the table.', 'Describe table.', 'Household', False),
+    ('toilet', '#FFFFFF', '<DETAILED_CAPTION>', 'Describe the toilet.', 'Describe toilet.', 'Household', False),
+    ('tv', '#0080FF', '<VQA>', 'What is showing on this TV?', 'Describe TV content.', 'Electronics', True),
+    ('laptop', '#0080FF', '<VQA>', 'What brand of laptop is this?', 'Identify laptop brand.', 'Electronics', True),
+    ('mouse', '#0080FF', '<VQA>', 'What brand of mouse is this?', 'Identify mouse brand.', 'Electronics', True),
+    ('remote', '#0080FF', '<DETAILED_CAPTION>', 'Describe the remote.', 'Describe remote.', 'Electronics', False),
+    ('keyboard', '#0080FF', '<VQA>', 'What brand of keyboard is this?', 'Identify keyboard brand.', 'Electronics', True),
+    ('cell phone', '#0080FF', '<VQA>', 'What model of phone is this?', 'Identify phone model.', 'Electronics', True),
+    ('microwave', '#0080FF', '<VQA>', 'What brand of microwave is this?', 'Identify microwave brand.', 'Electronics', False),
+    ('oven', '#0080FF', '<VQA>', 'What brand of oven is this?', 'Identify oven brand.', 'Electronics', False),
+    ('toaster', '#0080FF', '<VQA>', 'What brand of toaster is this?', 'Identify toaster brand.', 'Electronics', False),
+    ('sink', '#0080FF', '<DETAILED_CAPTION>', 'Describe the sink.', 'Describe sink.', 'Household', False),
+    ('refrigerator', '#0080FF', '<VQA>', 'What brand of refrigerator is this?', 'Identify refrigerator brand.', 'Household', False),
+    ('book', '#A52A2A', '<VQA>', 'What is the title of this book?', 'Identify book title and author.', 'Accessories', True),
+    ('clock', '#A52A2A', '<VQA>', 'What time is it on this clock?', 'Identify time on clock.', 'Household', True),
+    ('vase', '#A52A2A', '<DETAILED_CAPTION>', 'Describe the vase.', 'Describe vase style.', 'Household', False),
+    ('scissors', '#A52A2A', '<DETAILED_CAPTION>', 'Describe the scissors.', 'Describe scissors.', 'Household', False),
+    ('teddy bear', '#A52A2A', '<DETAILED_CAPTION>', 'Describe the teddy bear.', 'Describe teddy bear.', 'Accessories', False),
+    ('hair drier', '#A52A2A', '<VQA>', 'What brand is this hair drier?', 'Identify hair drier brand.', 'Electronics', False),
+    ('toothbrush', '#A52A2A', '<DETAILED_CAPTION>', 'Describe the toothbrush.', 'Describe toothbrush.', 'Household', False),
+)
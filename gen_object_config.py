@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Regenerate _object_config_data.py from object_config.json
+
+object_config.json is the editable source of the per-class settings. Run this
+script after changing it so the literal table imported by object_config.py
+stays in sync.
+"""
+
+import json
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+FIELDS = ("color", "task", "prompt", "llm_query", "category", "is_analyzable")
+
+HEADER = '''# _object_config_data.py
+# Generated by gen_object_config.py from object_config.json - do not edit.
+
+# One row per class, declared in COCO class-ID order (0..79) so the integer
+# class id produced by YOLO indexes the object_config tables directly.
+# Only literals here: the compiler folds the whole table into a single
+# constant that loads straight from the .pyc.
+# (name, color, task, prompt, llm_query, category, is_analyzable)
+'''
+
+
+def main():
+    config = json.loads((ROOT / "object_config.json").read_text(encoding="utf-8"))
+
+    lines = [HEADER, "_DATA = ("]
+    for name, entry in config.items():
+        row = (name,) + tuple(entry[field] for field in FIELDS)
+        lines.append(f"    {row!r},")
+    lines.append(")")
+
+    out_path = ROOT / "_object_config_data.py"
+    out_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"Wrote {len(config)} classes to {out_path.name}")
+
+
+if __name__ == "__main__":
+    main()
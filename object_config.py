@@ -8,239 +8,302 @@
 #   - Accessories/Food: Yellows/Cyan
 #   - Furniture/Electronics: Browns/Blues
 
-OBJECT_CONFIG = {
-    # --- Humans ---
-    "person": {
-        "color": "#00FF00",
-        "task": "<DETAILED_CAPTION>",
-        "prompt": "Identify this person.",
-        "llm_query": "Identify this person. Provide name or physical description.",
-        "category": "Humans",
-        "is_analyzable": True
-    },
-    
-    # --- Vehicles ---
-    "bicycle": {
-        "color": "#FF6B00",
-        "task": "<VQA>",
-        "prompt": "What type of bicycle is this?",
-        "llm_query": "Identify the type and notable features of this bicycle.",
-        "category": "Vehicles",
-        "is_analyzable": True
-    },
-    "car": {
-        "color": "#FF6B00",
-        "task": "<VQA>",
-        "prompt": "What is the make and model of this car?",
-        "llm_query": "Identify manufacturer, model, and estimated year.",
-        "category": "Vehicles",
-        "is_analyzable": True
-    },
-    "motorcycle": {
-        "color": "#FF6B00",
-        "task": "<VQA>",
-        "prompt": "What make and model is this motorcycle?",
-        "llm_query": "Identify manufacturer and model of this motorcycle.",
-        "category": "Vehicles",
-        "is_analyzable": True
-    },
-    "airplane": {
-        "color": "#FF6B00",
-        "task": "<VQA>",
-        "prompt": "What kind of aircraft is this?",
-        "llm_query": "Identify the aircraft model and airline if visible.",
-        "category": "Vehicles",
-        "is_analyzable": True
-    },
-    "bus": {
-        "color": "#FF6B00",
-        "task": "<VQA>",
-        "prompt": "What type of bus is this?",
-        "llm_query": "Identify the bus type and any company branding.",
-        "category": "Vehicles",
-        "is_analyzable": True
-    },
-    "train": {
-        "color": "#FF6B00",
-        "task": "<VQA>",
-        "prompt": "What type of train or locomotive is this?",
-        "llm_query": "Identify the train type and operator.",
-        "category": "Vehicles",
-        "is_analyzable": True
-    },
-    "truck": {
-        "color": "#FF6B00",
-        "task": "<VQA>",
-        "prompt": "What is the make and model of this truck?",
-        "llm_query": "Identify the truck manufacturer and configuration.",
-        "category": "Vehicles",
-        "is_analyzable": True
-    },
-    "boat": {
-        "color": "#FF6B00",
-        "task": "<VQA>",
-        "prompt": "What kind of boat or ship is this?",
-        "llm_query": "Identify the vessel type and name if visible.",
-        "category": "Vehicles",
-        "is_analyzable": True
-    },
-
-    # --- Animals ---
-    "bird": {
-        "color": "#FF00FF",
-        "task": "<VQA>",
-        "prompt": "What species of bird is this?",
-        "llm_query": "Identify the bird species and notable plumage details.",
-        "category": "Animals",
-        "is_analyzable": True
-    },
-    "cat": {
-        "color": "#FF00FF",
-        "task": "<VQA>",
-        "prompt": "What breed is this cat?",
-        "llm_query": "Identify the cat breed and coat patterns.",
-        "category": "Animals",
-        "is_analyzable": True
-    },
-    "dog": {
-        "color": "#FF00FF",
-        "task": "<VQA>",
-        "prompt": "What breed is this dog?",
-        "llm_query": "Identify the dog breed and size.",
-        "category": "Animals",
-        "is_analyzable": True
-    },
-    "horse": {
-        "color": "#FF00FF",
-        "task": "<VQA>",
-        "prompt": "What breed of horse is this?",
-        "llm_query": "Identify the horse breed and color.",
-        "category": "Animals",
-        "is_analyzable": True
-    },
-    "sheep": {
-        "color": "#FF00FF",
-        "task": "<DETAILED_CAPTION>",
-        "prompt": "Describe this sheep.",
-        "llm_query": "Describe the sheep's condition and environment.",
-        "category": "Animals",
-        "is_analyzable": False
-    },
-    "cow": {
-        "color": "#FF00FF",
-        "task": "<VQA>",
-        "prompt": "What breed of cattle is this?",
-        "llm_query": "Identify the cattle breed.",
-        "category": "Animals",
-        "is_analyzable": False
-    },
-    "elephant": {
-        "color": "#FF00FF",
-        "task": "<VQA>",
-        "prompt": "Is this an African or Asian elephant?",
-        "llm_query": "Identify the elephant species.",
-        "category": "Animals",
-        "is_analyzable": True
-    },
-    "bear": {
-        "color": "#FF00FF",
-        "task": "<VQA>",
-        "prompt": "What kind of bear is this?",
-        "llm_query": "Identify the bear species (Grizzly, Black, Polar, etc).",
-        "category": "Animals",
-        "is_analyzable": True
-    },
-    "zebra": {
-        "color": "#FF00FF",
-        "task": "<DETAILED_CAPTION>",
-        "prompt": "Describe this zebra.",
-        "llm_query": "Describe the zebra's appearance.",
-        "category": "Animals",
-        "is_analyzable": False
-    },
-    "giraffe": {
-        "color": "#FF00FF",
-        "task": "<DETAILED_CAPTION>",
-        "prompt": "Describe this giraffe.",
-        "llm_query": "Describe the giraffe's appearance.",
-        "category": "Animals",
-        "is_analyzable": False
-    },
-
-    # --- Outdoor/Infrastructure ---
-    "traffic light": {"color": "#FF0000", "task": "<VQA>", "prompt": "What color is the traffic light?", "llm_query": "Identify traffic light status.", "category": "Outdoors", "is_analyzable": False},
-    "fire hydrant": {"color": "#FF0000", "task": "<DETAILED_CAPTION>", "prompt": "Describe the hydrant.", "llm_query": "Describe fire hydrant.", "category": "Outdoors", "is_analyzable": False},
-    "stop sign": {"color": "#FF0000", "task": "<DETAILED_CAPTION>", "prompt": "Identify the sign.", "llm_query": "Confirm stop sign status.", "category": "Outdoors", "is_analyzable": False},
-    "parking meter": {"color": "#AAAAAA", "task": "<DETAILED_CAPTION>", "prompt": "Describe the meter.", "llm_query": "Describe parking meter.", "category": "Outdoors", "is_analyzable": False},
-    "bench": {"color": "#8B4513", "task": "<DETAILED_CAPTION>", "prompt": "Describe the bench.", "llm_query": "Describe bench style.", "category": "Outdoors", "is_analyzable": False},
-
-    # --- Accessories ---
-    "backpack": {"color": "#FFFF00", "task": "<VQA>", "prompt": "What brand is this backpack?", "llm_query": "Identify backpack brand/type.", "category": "Accessories", "is_analyzable": True},
-    "umbrella": {"color": "#00FFFF", "task": "<DETAILED_CAPTION>", "prompt": "Describe the umbrella.", "llm_query": "Describe umbrella.", "category": "Accessories", "is_analyzable": False},
-    "handbag": {"color": "#FFFF00", "task": "<VQA>", "prompt": "What brand is this handbag?", "llm_query": "Identify handbag brand.", "category": "Accessories", "is_analyzable": True},
-    "tie": {"color": "#FFFF00", "task": "<DETAILED_CAPTION>", "prompt": "Describe the tie.", "llm_query": "Describe tie pattern.", "category": "Accessories", "is_analyzable": False},
-    "suitcase": {"color": "#FFFF00", "task": "<VQA>", "prompt": "What brand is this suitcase?", "llm_query": "Identify suitcase brand.", "category": "Accessories", "is_analyzable": True},
-
-    # --- Sports ---
-    "frisbee": {"color": "#00FFFF", "task": "<DETAILED_CAPTION>", "prompt": "Describe the frisbee.", "llm_query": "Describe frisbee.", "category": "Sports", "is_analyzable": False},
-    "skis": {"color": "#00FFFF", "task": "<VQA>", "prompt": "What brand are these skis?", "llm_query": "Identify skis brand.", "category": "Sports", "is_analyzable": True},
-    "snowboard": {"color": "#00FFFF", "task": "<VQA>", "prompt": "What brand is this snowboard?", "llm_query": "Identify snowboard brand.", "category": "Sports", "is_analyzable": True},
-    "sports ball": {"color": "#00FFFF", "task": "<VQA>", "prompt": "What kind of ball is this?", "llm_query": "Identify the sport for this ball.", "category": "Sports", "is_analyzable": True},
-    "kite": {"color": "#00FFFF", "task": "<DETAILED_CAPTION>", "prompt": "Describe the kite.", "llm_query": "Describe kite.", "category": "Sports", "is_analyzable": False},
-    "baseball bat": {"color": "#00FFFF", "task": "<DETAILED_CAPTION>", "prompt": "Describe the bat.", "llm_query": "Describe bat.", "category": "Sports", "is_analyzable": False},
-    "baseball glove": {"color": "#00FFFF", "task": "<DETAILED_CAPTION>", "prompt": "Describe the glove.", "llm_query": "Describe glove.", "category": "Sports", "is_analyzable": False},
-    "skateboard": {"color": "#00FFFF", "task": "<VQA>", "prompt": "What is on the graphic of this skateboard?", "llm_query": "Describe skateboard graphic.", "category": "Sports", "is_analyzable": True},
-    "surfboard": {"color": "#00FFFF", "task": "<VQA>", "prompt": "What brand is this surfboard?", "llm_query": "Identify surfboard brand.", "category": "Sports", "is_analyzable": True},
-    "tennis racket": {"color": "#00FFFF", "task": "<VQA>", "prompt": "What brand is this racket?", "llm_query": "Identify racket brand.", "category": "Sports", "is_analyzable": True},
-
-    # --- Household/Kitchen ---
-    "bottle": {"color": "#FF4444", "task": "<VQA>", "prompt": "What is in this bottle?", "llm_query": "Identify bottle content/brand.", "category": "Household", "is_analyzable": True},
-    "wine glass": {"color": "#FF4444", "task": "<DETAILED_CAPTION>", "prompt": "Describe the glass.", "llm_query": "Describe wine glass.", "category": "Household", "is_analyzable": False},
-    "cup": {"color": "#FF4444", "task": "<VQA>", "prompt": "What brand or logo is on this cup?", "llm_query": "Identify cup branding.", "category": "Household", "is_analyzable": True},
-    "fork": {"color": "#FF4444", "task": "<DETAILED_CAPTION>", "prompt": "Describe the fork.", "llm_query": "Describe fork.", "category": "Household", "is_analyzable": False},
-    "knife": {"color": "#FF4444", "task": "<DETAILED_CAPTION>", "prompt": "Describe the knife.", "llm_query": "Describe knife.", "category": "Household", "is_analyzable": False},
-    "spoon": {"color": "#FF4444", "task": "<DETAILED_CAPTION>", "prompt": "Describe the spoon.", "llm_query": "Describe spoon.", "category": "Household", "is_analyzable": False},
-    "bowl": {"color": "#FF4444", "task": "<VQA>", "prompt": "What is in this bowl?", "llm_query": "Identify bowl contents.", "category": "Household", "is_analyzable": True},
-
-    # --- Food ---
-    "banana": {"color": "#CCFF00", "task": "<DETAILED_CAPTION>", "prompt": "Describe the banana.", "llm_query": "Describe banana ripeness.", "category": "Food", "is_analyzable": False},
-    "apple": {"color": "#CCFF00", "task": "<VQA>", "prompt": "What type of apple is this?", "llm_query": "Identify apple variety.", "category": "Food", "is_analyzable": True},
-    "sandwich": {"color": "#CCFF00", "task": "<VQA>", "prompt": "What kind of sandwich is this?", "llm_query": "Identify sandwich type/ingredients.", "category": "Food", "is_analyzable": True},
-    "orange": {"color": "#CCFF00", "task": "<VQA>", "prompt": "Is this an orange or a tangerine?", "llm_query": "Identify citrus type.", "category": "Food", "is_analyzable": False},
-    "broccoli": {"color": "#CCFF00", "task": "<DETAILED_CAPTION>", "prompt": "Describe the broccoli.", "llm_query": "Describe broccoli.", "category": "Food", "is_analyzable": False},
-    "carrot": {"color": "#CCFF00", "task": "<DETAILED_CAPTION>", "prompt": "Describe the carrot.", "llm_query": "Describe carrot.", "category": "Food", "is_analyzable": False},
-    "hot dog": {"color": "#CCFF00", "task": "<VQA>", "prompt": "What toppings are on this hot dog?", "llm_query": "Describe hot dog toppings.", "category": "Food", "is_analyzable": True},
-    "pizza": {"color": "#CCFF00", "task": "<VQA>", "prompt": "What toppings are on this pizza?", "llm_query": "Identify pizza toppings.", "category": "Food", "is_analyzable": True},
-    "donut": {"color": "#CCFF00", "task": "<VQA>", "prompt": "What kind of donut is this?", "llm_query": "Identify donut type.", "category": "Food", "is_analyzable": True},
-    "cake": {"color": "#CCFF00", "task": "<VQA>", "prompt": "What kind of cake is this?", "llm_query": "Identify cake type.", "category": "Food", "is_analyzable": True},
-
-    # --- Furniture ---
-    "chair": {"color": "#8B4513", "task": "<DETAILED_CAPTION>", "prompt": "Describe the chair.", "llm_query": "Describe chair style.", "category": "Household", "is_analyzable": True},
-    "couch": {"color": "#8B4513", "task": "<DETAILED_CAPTION>", "prompt": "Describe the couch.", "llm_query": "Describe couch style.", "category": "Household", "is_analyzable": True},
-    "potted plant": {"color": "#228B22", "task": "<VQA>", "prompt": "What species of plant is this?", "llm_query": "Identify plant species.", "category": "Outdoors", "is_analyzable": True},
-    "bed": {"color": "#8B4513", "task": "<DETAILED_CAPTION>", "prompt": "Describe the bed.", "llm_query": "Describe bed type.", "category": "Household", "is_analyzable": False},
-    "dining table": {"color": "#8B4513", "task": "<DETAILED_CAPTION>", "prompt": "Describe the table.", "llm_query": "Describe table.", "category": "Household", "is_analyzable": False},
-    "toilet": {"color": "#FFFFFF", "task": "<DETAILED_CAPTION>", "prompt": "Describe the toilet.", "llm_query": "Describe toilet.", "category": "Household", "is_analyzable": False},
-
-    # --- Electronics ---
-    "tv": {"color": "#0080FF", "task": "<VQA>", "prompt": "What is showing on this TV?", "llm_query": "Describe TV content.", "category": "Electronics", "is_analyzable": True},
-    "laptop": {"color": "#0080FF", "task": "<VQA>", "prompt": "What brand of laptop is this?", "llm_query": "Identify laptop brand.", "category": "Electronics", "is_analyzable": True},
-    "mouse": {"color": "#0080FF", "task": "<VQA>", "prompt": "What brand of mouse is this?", "llm_query": "Identify mouse brand.", "category": "Electronics", "is_analyzable": True},
-    "remote": {"color": "#0080FF", "task": "<DETAILED_CAPTION>", "prompt": "Describe the remote.", "llm_query": "Describe remote.", "category": "Electronics", "is_analyzable": False},
-    "keyboard": {"color": "#0080FF", "task": "<VQA>", "prompt": "What brand of keyboard is this?", "llm_query": "Identify keyboard brand.", "category": "Electronics", "is_analyzable": True},
-    "cell phone": {"color": "#0080FF", "task": "<VQA>", "prompt": "What model of phone is this?", "llm_query": "Identify phone model.", "category": "Electronics", "is_analyzable": True},
-    "microwave": {"color": "#0080FF", "task": "<VQA>", "prompt": "What brand of microwave is this?", "llm_query": "Identify microwave brand.", "category": "Electronics", "is_analyzable": False},
-    "oven": {"color": "#0080FF", "task": "<VQA>", "prompt": "What brand of oven is this?", "llm_query": "Identify oven brand.", "category": "Electronics", "is_analyzable": False},
-    "toaster": {"color": "#0080FF", "task": "<VQA>", "prompt": "What brand of toaster is this?", "llm_query": "Identify toaster brand.", "category": "Electronics", "is_analyzable": False},
-    "sink": {"color": "#0080FF", "task": "<DETAILED_CAPTION>", "prompt": "Describe the sink.", "llm_query": "Describe sink.", "category": "Household", "is_analyzable": False},
-    "refrigerator": {"color": "#0080FF", "task": "<VQA>", "prompt": "What brand of refrigerator is this?", "llm_query": "Identify refrigerator brand.", "category": "Household", "is_analyzable": False},
-
-    # --- Misc ---
-    "book": {"color": "#A52A2A", "task": "<VQA>", "prompt": "What is the title of this book?", "llm_query": "Identify book title and author.", "category": "Accessories", "is_analyzable": True},
-    "clock": {"color": "#A52A2A", "task": "<VQA>", "prompt": "What time is it on this clock?", "llm_query": "Identify time on clock.", "category": "Household", "is_analyzable": True},
-    "vase": {"color": "#A52A2A", "task": "<DETAILED_CAPTION>", "prompt": "Describe the vase.", "llm_query": "Describe vase style.", "category": "Household", "is_analyzable": False},
-    "scissors": {"color": "#A52A2A", "task": "<DETAILED_CAPTION>", "prompt": "Describe the scissors.", "llm_query": "Describe scissors.", "category": "Household", "is_analyzable": False},
-    "teddy bear": {"color": "#A52A2A", "task": "<DETAILED_CAPTION>", "prompt": "Describe the teddy bear.", "llm_query": "Describe teddy bear.", "category": "Accessories", "is_analyzable": False},
-    "hair drier": {"color": "#A52A2A", "task": "<VQA>", "prompt": "What brand is this hair drier?", "llm_query": "Identify hair drier brand.", "category": "Electronics", "is_analyzable": False},
-    "toothbrush": {"color": "#A52A2A", "task": "<DETAILED_CAPTION>", "prompt": "Describe the toothbrush.", "llm_query": "Describe toothbrush.", "category": "Household", "is_analyzable": False},
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
+import json
+from sys import intern
+from types import MappingProxyType
+from typing import Dict, Final, FrozenSet, Optional, Tuple
+
+# object_config.json is the editable source; _object_config_data.py is
+# generated from it by gen_object_config.py. Everything at runtime, including
+# the config served to the frontend, comes from _DATA, so the server and
+# frontend can't drift apart when the JSON is edited without regenerating.
+from _object_config_data import _DATA
+
+# Column order of the settings in each _DATA row, after the class name
+_FIELDS = ("color", "task", "prompt", "llm_query", "category", "is_analyzable")
+
+# Shared values repeated across rows, interned so equality checks against
+# them can short-circuit on identity
+VQA = intern("<VQA>")
+DETAILED_CAPTION = intern("<DETAILED_CAPTION>")
+
+CAT_HUMANS = intern("Humans")
+CAT_VEHICLES = intern("Vehicles")
+CAT_OUTDOORS = intern("Outdoors")
+CAT_ANIMALS = intern("Animals")
+CAT_ACCESSORIES = intern("Accessories")
+CAT_SPORTS = intern("Sports")
+CAT_HOUSEHOLD = intern("Household")
+CAT_FOOD = intern("Food")
+CAT_ELECTRONICS = intern("Electronics")
+
+GREEN = intern("#00FF00")
+ORANGE = intern("#FF6B00")
+MAGENTA = intern("#FF00FF")
+RED = intern("#FF0000")
+GREY = intern("#AAAAAA")
+BROWN = intern("#8B4513")
+YELLOW = intern("#FFFF00")
+CYAN = intern("#00FFFF")
+LIGHT_RED = intern("#FF4444")
+LIME = intern("#CCFF00")
+FOREST_GREEN = intern("#228B22")
+WHITE = intern("#FFFFFF")
+AZURE = intern("#0080FF")
+AUBURN = intern("#A52A2A")
+
+_TASK_TOKENS = (VQA, DETAILED_CAPTION)
+_CATEGORY_LABELS = (
+    CAT_HUMANS, CAT_VEHICLES, CAT_OUTDOORS, CAT_ANIMALS, CAT_ACCESSORIES,
+    CAT_SPORTS, CAT_HOUSEHOLD, CAT_FOOD, CAT_ELECTRONICS,
+)
+
+
+class Task(IntEnum):
+    """Florence-2 task, stored as a small int; .token is the prompt token"""
+    VQA = 0
+    DETAILED_CAPTION = 1
+
+    @property
+    def token(self):
+        return _TASK_TOKENS[self]
+
+
+class Category(IntEnum):
+    """Object category, stored as a small int; .label is the display name"""
+    HUMANS = 0
+    VEHICLES = 1
+    OUTDOORS = 2
+    ANIMALS = 3
+    ACCESSORIES = 4
+    SPORTS = 5
+    HOUSEHOLD = 6
+    FOOD = 7
+    ELECTRONICS = 8
+
+    @property
+    def label(self):
+        return _CATEGORY_LABELS[self]
+
+
+# Token/label -> enum member, used to decode the string columns of _DATA
+TASK_IDS = {task.token: task for task in Task}
+CATEGORY_IDS = {category.label: category for category in Category}
+
+
+@dataclass(frozen=True, slots=True)
+class ObjectSpec:
+    """Immutable per-class settings for one COCO class"""
+    color: str
+    task: Task
+    prompt: str
+    llm_query: str
+    category: Category
+    is_analyzable: bool
+    # Specs are used as dict/set keys when grouping detections, so hash once
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_hash", hash(
+            (self.color, self.task, self.prompt, self.llm_query, self.category, self.is_analyzable)
+        ))
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        # Rebuild through __init__ so the cached hash matches the receiving
+        # process's string hash seed
+        return ObjectSpec, (self.color, self.task, self.prompt, self.llm_query, self.category, self.is_analyzable)
+
+
+# Struct-of-arrays view: one tuple per field, indexed by class id
+NAMES, COLORS, TASKS, PROMPTS, LLM_QUERIES, CATEGORIES, _ANALYZABLE_FLAGS = zip(*_DATA)
+# Point the repeated columns at the interned constants above
+COLORS, TASKS, CATEGORIES = (tuple(map(intern, column)) for column in (COLORS, TASKS, CATEGORIES))
+NAME_TO_ID: Final[Dict[str, int]] = {name: class_id for class_id, name in enumerate(NAMES)}
+# Rows follow the canonical COCO order, so detector ids index everything here
+COCO_ID_TO_NAME = NAMES
+COCO_NAME_TO_ID = NAME_TO_ID
+# TASKS/CATEGORIES keep the wire strings; the specs carry the enum values
+SPECS: Final[Tuple[ObjectSpec, ...]] = tuple(map(
+    ObjectSpec,
+    COLORS,
+    map(TASK_IDS.__getitem__, TASKS),
+    PROMPTS,
+    LLM_QUERIES,
+    map(CATEGORY_IDS.__getitem__, CATEGORIES),
+    _ANALYZABLE_FLAGS,
+))
+
+
+def _hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+def _hex_to_bgr(color: str) -> Tuple[int, int, int]:
+    return int(color[5:7], 16), int(color[3:5], 16), int(color[1:3], 16)
+
+
+# Derived tables below are built lazily by the module __getattr__ on first
+# access and then cached as real module globals, so importing this module only
+# pays for what a consumer actually reads. Inside this module, go through
+# _table() since plain global lookups don't trigger __getattr__.
+
+
+def _table(name):
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+# Per-class arrays for vectorized filtering/colorizing of detection batches
+def _build_is_analyzable():
+    import numpy as np
+    return np.array(_ANALYZABLE_FLAGS, dtype=bool)
+
+
+def _build_analyzable_mask() -> int:
+    # Bit i is set iff class id i is analyzable: (ANALYZABLE_MASK >> class_id) & 1
+    return sum(1 << class_id for class_id, flag in enumerate(_ANALYZABLE_FLAGS) if flag)
+
+
+def _build_colors_rgb():
+    import numpy as np
+    return np.array([_hex_to_rgb(color) for color in COLORS], dtype=np.uint8)
+
+
+def _build_colors_bgr() -> Dict[str, Tuple[int, int, int]]:
+    # OpenCV-ready color tuples, parsed once instead of per drawn box
+    return {name: _hex_to_bgr(color) for name, color in zip(NAMES, COLORS)}
+
+
+def _build_colors_bgr_arr():
+    # (N, 3) uint8 so a batch of class ids can be tinted with one gather:
+    # COLORS_BGR_ARR[class_ids]
+    import numpy as np
+    return np.array([_hex_to_bgr(color) for color in COLORS], dtype=np.uint8)
+
+
+def _build_object_arr():
+    # Whole-table record array: OBJECT_ARR[class_ids] gathers the metadata for
+    # a batch of detections in one go. Prompts stay in the tuples above since
+    # they are variable length and consumed one at a time.
+    import numpy as np
+    return np.array(
+        [
+            (name, rgb, spec.task, spec.is_analyzable)
+            for name, rgb, spec in zip(NAMES, _table("COLORS_RGB"), SPECS)
+        ],
+        dtype=[("name", "U20"), ("color", "u1", 3), ("task", "u1"), ("is_analyzable", "?")],
+    )
+
+
+def _build_task_arr():
+    # Per-class Task codes, e.g. vqa_mask = OBJECT_CONFIG_TASK_ARR[class_ids] == Task.VQA
+    import numpy as np
+    return np.fromiter((spec.task for spec in SPECS), dtype=np.uint8, count=len(SPECS))
+
+
+def _build_requests() -> Tuple[str, ...]:
+    # Fully formatted Florence-2 prompts, indexed by class id. <DETAILED_CAPTION>
+    # must be sent as the bare task token or the processor rejects it.
+    return tuple(
+        task if task == DETAILED_CAPTION else task + prompt for task, prompt in zip(TASKS, PROMPTS)
+    )
+
+
+def _build_llm_requests() -> Tuple[str, ...]:
+    # Identification hint used when refining vision output with the summarizer
+    return tuple(llm_query or prompt for llm_query, prompt in zip(LLM_QUERIES, PROMPTS))
+
+
+def _build_classes_by_category() -> Dict[str, FrozenSet[str]]:
+    return {
+        category: frozenset(name for name, cat in zip(NAMES, CATEGORIES) if cat == category)
+        for category in dict.fromkeys(CATEGORIES)
+    }
+
+
+def _build_object_config():
+    # The legacy dict-of-dicts view, read-only at both levels so it can be
+    # shared without copying
+    return MappingProxyType(
+        {class_name: MappingProxyType(entry) for class_name, entry in load_object_config().items()}
+    )
+
+
+_BUILDERS = {
+    "IS_ANALYZABLE": _build_is_analyzable,
+    "ANALYZABLE_BV": lambda: _table("IS_ANALYZABLE"),
+    "ANALYZABLE_MASK": _build_analyzable_mask,
+    "COLORS_RGB": _build_colors_rgb,
+    "COLORS_BGR": _build_colors_bgr,
+    "COLORS_BGR_ARR": _build_colors_bgr_arr,
+    "OBJECT_ARR": _build_object_arr,
+    "OBJECT_CONFIG_TASK_ARR": _build_task_arr,
+    "REQUESTS": _build_requests,
+    "LLM_REQUESTS": _build_llm_requests,
+    # UTF-8 encoded prompts for callers that put them straight into request bodies
+    "PROMPTS_BYTES": lambda: tuple(prompt.encode("utf-8") for prompt in PROMPTS),
+    "LLM_QUERIES_BYTES": lambda: tuple(query.encode("utf-8") for query in LLM_QUERIES),
+    # Class-name sets for O(1) membership filtering
+    "ANALYZABLE": lambda: frozenset(name for name, spec in zip(NAMES, SPECS) if spec.is_analyzable),
+    "VQA_CLASSES": lambda: frozenset(name for name, task in zip(NAMES, TASKS) if task == VQA),
+    "CAPTION_CLASSES": lambda: frozenset(name for name, task in zip(NAMES, TASKS) if task == DETAILED_CAPTION),
+    "CLASSES_BY_CATEGORY": _build_classes_by_category,
+    "OBJECT_CONFIG": _build_object_config,
 }
+
+
+def get(name: str) -> Optional[ObjectSpec]:
+    """Return the ObjectSpec for a class name, or None if the class is unknown"""
+    class_id = NAME_TO_ID.get(name)
+    return SPECS[class_id] if class_id is not None else None
+
+
+# Per-field accessors for per-detection callers. The key space is bounded by
+# the 80 class names, so the caches never need to evict.
+@lru_cache(maxsize=None)
+def get_color(name: str) -> Optional[Tuple[int, int, int]]:
+    """Return the BGR color tuple for a class name, or None if unknown"""
+    return _table("COLORS_BGR").get(name)
+
+
+@lru_cache(maxsize=None)
+def get_task(name: str) -> Optional[str]:
+    """Return the Florence-2 task token for a class name, or None if unknown"""
+    class_id = NAME_TO_ID.get(name)
+    return TASKS[class_id] if class_id is not None else None
+
+
+@lru_cache(maxsize=None)
+def get_prompt(name: str) -> Optional[str]:
+    """Return the Florence-2 prompt for a class name, or None if unknown"""
+    class_id = NAME_TO_ID.get(name)
+    return PROMPTS[class_id] if class_id is not None else None
+
+
+@lru_cache(maxsize=1)
+def load_object_config() -> Dict[str, Dict[str, object]]:
+    """Per-class settings (name -> settings dict) in object_config.json's shape, built from _DATA"""
+    return {row[0]: dict(zip(_FIELDS, row[1:])) for row in _DATA}
+
+
+@lru_cache(maxsize=1)
+def load_object_config_json() -> bytes:
+    """JSON encoding of load_object_config(), built once and served as-is by the API"""
+    return json.dumps(load_object_config(), ensure_ascii=False).encode("utf-8")
+
+
+def __getattr__(name):
+    builder = _BUILDERS.get(name)
+    if builder is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = builder()
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_BUILDERS))
@@ -4,26 +4,49 @@ Ultralytics YOLO Object Detection API Server
 Replaces Ollama integration with YOLOv8 for real-time object detection
 """
 
-from contextlib import asynccontextmanager
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+import asyncio
+import time
 from pathlib import Path
 import logging
-import base64
 import io
-import requests
-import hashlib
+import httpx
 from typing import Dict, Any
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Must be set before torch initializes CUDA: expandable segments let the
+# caching allocator grow blocks in place instead of fragmenting VRAM across
+# the three models and the variable-sized crops
+os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True,max_split_size_mb:512")
 
 import numpy as np
+import orjson
+import pybase64
+import xxhash
 import torch
-from PIL import Image
-from fastapi import FastAPI, UploadFile, File, HTTPException
+import torch.nn.functional as F
+from torchvision.io import ImageReadMode, decode_jpeg
+import PIL
+from PIL import Image, features as pil_features
+from fastapi import Depends, FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
 from fastapi import Request
 from ultralytics import YOLO
-from transformers import AutoProcessor, AutoModelForCausalLM, AutoTokenizer
+from ultralytics.utils import ops
+from transformers import (
+    AutoProcessor, AutoModelForCausalLM, AutoTokenizer, StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer,
+)
 import uvicorn
-from object_config import OBJECT_CONFIG
+import object_config
+from object_config import (
+    ANALYZABLE_MASK, COCO_ID_TO_NAME, COCO_NAME_TO_ID, LLM_REQUESTS, REQUESTS, SPECS, TASKS,
+    VQA, DETAILED_CAPTION,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -35,22 +58,610 @@ florence_processor = None
 summarizer_model = None
 summarizer_tokenizer = None
 current_summarize_id = 0  # To track and cancel old summarization requests
+# Florence-2 tasks whose output encodes boxes/polygons and needs the processor's parser
+FLORENCE_STRUCTURED_TASKS = frozenset({
+    "<OD>", "<DENSE_REGION_CAPTION>", "<REGION_PROPOSAL>", "<CAPTION_TO_PHRASE_GROUNDING>",
+    "<REFERRING_EXPRESSION_SEGMENTATION>", "<REGION_TO_SEGMENTATION>", "<OPEN_VOCABULARY_DETECTION>",
+    "<OCR_WITH_REGION>",
+})
+# Per-task generate() settings. Greedy decoding throughout (beam search
+# multiplies decoder work by num_beams), with output caps sized to each
+# task's answers so a runaway generation can't hold up a whole batch
+FLORENCE_GEN_CFG = {
+    "<CAPTION>": {"max_new_tokens": 64, "num_beams": 1, "do_sample": False},
+    "<DETAILED_CAPTION>": {"max_new_tokens": 128, "num_beams": 1, "do_sample": False},
+    "<MORE_DETAILED_CAPTION>": {"max_new_tokens": 256, "num_beams": 1, "do_sample": False},
+    "<VQA>": {"max_new_tokens": 32, "num_beams": 1, "do_sample": False},
+}
+FLORENCE_DEFAULT_GEN_CFG = {"max_new_tokens": 128, "num_beams": 1, "do_sample": False}
+# Optional weight quantization for the Florence-2 decoder: "int8" (bitsandbytes)
+# or "fp8" (TorchAO); halves/quarters weight bytes read per decoded token
+FLORENCE_QUANTIZATION = os.environ.get("FLORENCE_QUANTIZATION", "").lower()
+# KV caching for Florence-2 decoding; flipped off if this transformers
+# version trips over the remote code's cache handling
+florence_use_cache = True
+# Concurrent detect requests are micro-batched into one YOLO forward pass
+YOLO_MAX_BATCH = 8
+YOLO_BATCH_WINDOW = 0.01  # seconds to wait for more images after the first
+yolo_queue = None  # asyncio.Queue of (image_gpu, future), created in lifespan
+# Concurrent Florence-2 prompts are batched the same way
+FLORENCE_MAX_BATCH = 8
+FLORENCE_BATCH_WINDOW = 0.015
+florence_queue = None  # asyncio.Queue of (input_ids, image_features, task, future), created in lifespan
+# Florence-2 vision features per (image hash, crop box), so repeat questions
+# about the same crop skip the vision encoder. LRU, bounded by tensor bytes.
+FLORENCE_FEATURE_CACHE_BYTES = 512 * 1024 * 1024
+florence_feature_cache = OrderedDict()
+florence_feature_cache_bytes = 0
+# Final parsed Florence-2 answers per (image hash, box, prompt); LRU by entry count
+FLORENCE_RESULT_CACHE_SIZE = 10000
+florence_result_cache = OrderedDict()
+http_client = None  # shared httpx.AsyncClient for image downloads, created in lifespan
+# One CUDA stream per model so YOLO, Florence and Qwen work can overlap; None on CPU
+yolo_stream = None
+florence_stream = None
+qwen_stream = None
+# One long-lived worker thread per generative model: its compile warm-up and
+# every later call run on the same thread, so compiled state is never shared
+# across threads, while the two threads still launch onto their own streams
+florence_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="florence")
+qwen_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qwen")
 device = "cuda" if torch.cuda.is_available() else "cpu"
-# Set dtype based on device availability
-dtype = torch.float16 if torch.cuda.is_available() else torch.float32
+# Predict kwargs for every YOLO call: FP16 on tensor cores, fixed 640px letterbox,
+# and an explicit device so Ultralytics doesn't re-resolve it per call
+YOLO_PREDICT_ARGS = {"half": device == "cuda", "imgsz": 640, "device": 0 if device == "cuda" else "cpu"}
+# Set dtype based on device availability: BF16 on Ampere and newer (same
+# tensor-core throughput as FP16 without its overflow risk), FP16 otherwise.
+# Checked by compute capability because is_bf16_supported() also reports
+# True on older GPUs, where BF16 is only emulated and much slower.
+if torch.cuda.is_available():
+    dtype = torch.bfloat16 if torch.cuda.get_device_capability()[0] >= 8 else torch.float16
+else:
+    dtype = torch.float32
+
+# Base system prompt for Qwen - Neutral and performance-oriented
+DEFAULT_SYSTEM_PROMPT = (
+    "You are the AI Scanner OS. Direct, cold, and factual. "
+    "Skip all 'thinking' and preamble. Do not use phrases like 'The image shows' or 'Here is a summary'. "
+    "Output only the final analytical data."
+)
+# Stand-in user message used to split the rendered chat template around the query
+_QUERY_PLACEHOLDER = "\x00QUERY\x00"
 
 logger.info(f"Using device: {device} with dtype: {dtype}")
+# Pillow only decodes what nvJPEG/TurboJPEG can't (non-JPEG uploads) and reads
+# saved-image headers; log which build and JPEG backend that is
+logger.info(
+    f"Pillow {PIL.__version__}, libjpeg-turbo: {pil_features.check_feature('libjpeg_turbo')}"
+)
+
+# libjpeg-turbo decoder for JPEG uploads; needs both PyTurboJPEG and the native library
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    turbo_jpeg = TurboJPEG()
+except Exception as e:
+    turbo_jpeg = None
+    logger.warning(f"PyTurboJPEG unavailable, decoding JPEGs with Pillow: {e}")
+
+def decode_image(image_bytes):
+    """Decode image bytes into a contiguous RGB uint8 array"""
+    # Only JPEGs (FF D8 FF magic) go through libjpeg-turbo; PNG etc. fall through to Pillow
+    if turbo_jpeg is not None and image_bytes[:3] == b"\xff\xd8\xff":
+        try:
+            return turbo_jpeg.decode(image_bytes, pixel_format=TJPF_RGB)
+        except Exception as e:
+            logger.warning(f"TurboJPEG decode failed, falling back to Pillow: {e}")
+    return np.asarray(Image.open(io.BytesIO(image_bytes)).convert("RGB"))
+
+def decode_image_to_device(image_bytes):
+    """
+    Decode image bytes into a CHW RGB uint8 tensor on the device. JPEGs are
+    decoded by nvJPEG straight into GPU memory, so only the compressed bytes
+    cross PCIe; everything else (and CPU-only runs) goes through decode_image.
+    """
+    if device == "cuda" and image_bytes[:3] == b"\xff\xd8\xff":
+        try:
+            # bytearray: torch.frombuffer wants a writable buffer
+            data = torch.frombuffer(bytearray(image_bytes), dtype=torch.uint8)
+            return decode_jpeg(data, mode=ImageReadMode.RGB, device=device)
+        except Exception as e:
+            logger.warning(f"nvJPEG decode failed, falling back to CPU decode: {e}")
+    return to_device_image(decode_image(image_bytes))
+
+def to_device_async(tensor):
+    """
+    Host-to-device copy through pinned memory, so it's an async DMA that can
+    overlap model work on the per-model streams. The pinned staging blocks come
+    from PyTorch's caching host allocator, which keeps each one alive until its
+    copy has finished and then reuses it.
+    """
+    if device != "cuda":
+        return tensor
+    return tensor.pin_memory().to(device, non_blocking=True)
+
+def to_device_image(image_np):
+    """Upload an HWC RGB uint8 array to the device once, as a CHW tensor crops can slice"""
+    return to_device_async(torch.from_numpy(np.ascontiguousarray(image_np))).permute(2, 0, 1)
+
+def letterbox_gpu(image_gpu, size):
+    """
+    Letterbox a CHW uint8 device tensor into a (1, 3, size, size) float batch in
+    [0, 1], padded the same way as Ultralytics' LetterBox so ops.scale_boxes can
+    map predictions back to the original pixels
+    """
+    height, width = image_gpu.shape[-2:]
+    gain = min(size / height, size / width)
+    new_h, new_w = round(height * gain), round(width * gain)
+    top, left = round((size - new_h) / 2 - 0.1), round((size - new_w) / 2 - 0.1)
+    resized = F.interpolate(image_gpu.unsqueeze(0).float(), size=(new_h, new_w), mode="bilinear", align_corners=False)
+    batch = torch.full((1, 3, size, size), 114.0, device=image_gpu.device)
+    batch[:, :, top:top + new_h, left:left + new_w] = resized
+    return batch.div_(255.0)
+
+def yolo_predict(images, **kwargs):
+    """
+    Run YOLO on a list of CHW uint8 device tensors as one batch and rescale each
+    result's boxes back to its source image
+    """
+    size = YOLO_PREDICT_ARGS["imgsz"]
+    # Note: given a tensor source, Ultralytics' postprocess still builds each
+    # result's orig_img with ops.convert_torch2numpy_batch, i.e. one
+    # device-to-host copy (and sync) of the B x 640 x 640 x 3 letterboxed
+    # batch per call. That copy is of the fixed 640px batch rather than the
+    # full-resolution frames, but the pipeline is not copy-free; avoiding it
+    # would mean running NMS outside the predictor.
+    with on_stream(yolo_stream):
+        batch = torch.cat([letterbox_gpu(image, size) for image in images])
+        results = yolo_model(batch, **YOLO_PREDICT_ARGS, **kwargs)
+    for image, result in zip(images, results):
+        orig_shape = tuple(image.shape[-2:])
+        data = result.boxes.data.clone()
+        data[:, :4] = ops.scale_boxes(batch.shape[2:], data[:, :4], orig_shape)
+        result.orig_shape = orig_shape
+        result.update(boxes=data)
+    return results
+
+# PIL resample codes (as stored in the image processor config) -> F.interpolate modes
+_INTERPOLATE_MODES = {2: "bilinear", 3: "bicubic"}
+
+def florence_pixel_values(crop):
+    """
+    Resize and normalize a CHW uint8 crop on-device into Florence-2 pixel_values,
+    replacing the processor's CPU/PIL resize
+    """
+    image_processor = florence_processor.image_processor
+    size = (image_processor.size["height"], image_processor.size["width"])
+    # Match the processor's PIL resize (bicubic, antialiased when shrinking) so
+    # the encoder sees the same pixels it was trained on; bicubic overshoots,
+    # so clamp back to the uint8 range before rescaling
+    mode = _INTERPOLATE_MODES.get(getattr(image_processor, "resample", 3), "bicubic")
+    pixels = F.interpolate(
+        crop.unsqueeze(0).float(), size=size, mode=mode, align_corners=False, antialias=True
+    ).clamp_(0, 255)
+    mean = torch.tensor(image_processor.image_mean, device=pixels.device).view(1, 3, 1, 1)
+    std = torch.tensor(image_processor.image_std, device=pixels.device).view(1, 3, 1, 1)
+    return (pixels * image_processor.rescale_factor - mean) / std
+
+@lru_cache(maxsize=256)
+def florence_input_ids(prompt):
+    """
+    Tokenize a Florence-2 prompt without touching the image path of the
+    processor. Prompts come from a small fixed set (task tokens and the
+    per-class REQUESTS), so the on-device ids are cached per prompt; callers
+    must not modify the returned tensor in place.
+    """
+    # _construct_prompts expands task tokens (e.g. <DETAILED_CAPTION>) into the text the model was trained on
+    text = florence_processor._construct_prompts([prompt])
+    return florence_processor.tokenizer(text, return_tensors="pt")["input_ids"].to(device)
+
+@lru_cache(maxsize=8)
+def chat_template_ids(system_prompt):
+    """
+    Token ids of the chat template before and after the user message for a
+    given system prompt, so each request only has to tokenize its own query
+    """
+    rendered = summarizer_tokenizer.apply_chat_template(
+        [{"role": "system", "content": system_prompt}, {"role": "user", "content": _QUERY_PLACEHOLDER}],
+        tokenize=False,
+        add_generation_prompt=True
+    )
+    prefix, suffix = rendered.split(_QUERY_PLACEHOLDER)
+    return (
+        summarizer_tokenizer.encode(prefix, add_special_tokens=False),
+        summarizer_tokenizer.encode(suffix, add_special_tokens=False),
+    )
+
+@lru_cache(maxsize=256)
+def query_ids(query):
+    """Token ids for a user query; repeated queries skip the tokenizer entirely"""
+    return tuple(summarizer_tokenizer.encode(query, add_special_tokens=False))
+
+class CancelCriteria(StoppingCriteria):
+    """Stops generation once a newer summarize request has started"""
+    # Checking every 8th token keeps the per-token Python callback to an
+    # increment; a cancelled request decodes at most 7 extra tokens
+    CHECK_EVERY = 8
+
+    def __init__(self, target_id):
+        self.target_id = target_id
+        self.steps = 0
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> bool:
+        self.steps += 1
+        # If a new request has started, stop this one
+        return self.steps % self.CHECK_EVERY == 0 and current_summarize_id != self.target_id
+
+@contextmanager
+def on_stream(stream):
+    """
+    Run the block on a model's own CUDA stream (no-op when stream is None),
+    ordered after work already queued on the current stream, with the current
+    stream waiting for it afterwards so results are safe to read
+    """
+    if stream is None:
+        yield
+        return
+    current = torch.cuda.current_stream()
+    stream.wait_stream(current)
+    with torch.cuda.stream(stream):
+        yield
+    current.wait_stream(stream)
+
+def autocast():
+    """Autocast to the model dtype (BF16/FP16) around generate() on CUDA; a no-op on CPU"""
+    return torch.autocast(device_type=device, dtype=dtype, enabled=(device == "cuda"))
+
+def compile_with_warmup(module, name, warmup):
+    """
+    Swap module.forward for a torch.compile'd version (CUDA only) and run one
+    warm-up pass so the Inductor/Triton compile happens at startup instead of
+    on the first request. Falls back to eager mode if anything goes wrong.
+    Default mode rather than reduce-overhead: CUDA-graph trees keep
+    thread-local state and generate() runs on worker threads, and the
+    growing KV cache would re-record a graph per decode length anyway.
+    """
+    if device != "cuda":
+        return
+    eager_forward = module.forward
+    try:
+        module.forward = torch.compile(eager_forward, dynamic=True)
+        with torch.inference_mode():
+            warmup()
+        logger.info(f"{name} compiled with torch.compile")
+    except Exception as e:
+        module.forward = eager_forward
+        logger.warning(f"torch.compile failed for {name}, running in eager mode: {e}")
+
+def warmup_summarizer():
+    inputs = summarizer_tokenizer("Warm-up", return_tensors="pt").to(summarizer_model.device)
+    # Warm up (and capture any compiled graphs) on the stream requests will use
+    with on_stream(qwen_stream), autocast():
+        summarizer_model.generate(**inputs, max_new_tokens=4, do_sample=False)
+
+def warmup_florence():
+    inputs = florence_processor(text=DETAILED_CAPTION, images=Image.new("RGB", (224, 224)), return_tensors="pt")
+    inputs = inputs.to(device)
+    with on_stream(florence_stream), autocast():
+        florence_model.generate(
+            input_ids=inputs["input_ids"],
+            pixel_values=inputs["pixel_values"],
+            max_new_tokens=4,
+            do_sample=False
+        )
+
+async def collect_batch(queue, max_batch, window):
+    """Wait for one queued item, then take up to max_batch within window seconds of it"""
+    items = [await queue.get()]
+    deadline = time.monotonic() + window
+    while len(items) < max_batch:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            items.append(await asyncio.wait_for(queue.get(), remaining))
+        except asyncio.TimeoutError:
+            break
+    return items
+
+async def yolo_batcher():
+    """
+    Drain yolo_queue in batches of up to YOLO_MAX_BATCH images, waiting at most
+    YOLO_BATCH_WINDOW after the first one, so concurrent requests share a single
+    forward pass instead of paying kernel launch overhead once per image.
+    """
+    while True:
+        items = await collect_batch(yolo_queue, YOLO_MAX_BATCH, YOLO_BATCH_WINDOW)
+        try:
+            # Off the event loop so requests keep queueing while the GPU runs
+            results = await asyncio.to_thread(yolo_predict, [image_gpu for image_gpu, _ in items])
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+def b64decode_image(image_data):
+    """SIMD base64 decode; tolerates a data:image/...;base64, URL prefix"""
+    if image_data.startswith("data:"):
+        image_data = image_data.partition(",")[2]
+    return pybase64.b64decode(image_data, validate=False)
+
+async def b64decode_async(image_data):
+    """base64-decode in a worker thread so multi-MB payloads don't stall the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(None, b64decode_image, image_data)
+
+async def download_image(image_url):
+    """Fetch image bytes without blocking the event loop; raises httpx.HTTPError on failure"""
+    response = await http_client.get(image_url)
+    response.raise_for_status()
+    return response.content
+
+async def run_yolo(image_gpu):
+    """
+    Queue one image (CHW uint8 tensor from to_device_image) for batched YOLO
+    inference; returns a one-element results list
+    """
+    future = asyncio.get_running_loop().create_future()
+    await yolo_queue.put((image_gpu, future))
+    return [await future]
+
+def quantize_florence_fp8():
+    """
+    FP8 dynamic quantization of Florence-2's language model via TorchAO
+    (needs an Ada/Hopper GPU); leaves the model untouched if that fails
+    """
+    try:
+        from torchao.quantization import quantize_, float8_dynamic_activation_float8_weight
+        quantize_(getattr(florence_model, "language_model", florence_model), float8_dynamic_activation_float8_weight())
+        logger.info("Florence-2 language model quantized to FP8")
+    except Exception as e:
+        logger.warning(f"FP8 quantization unavailable, running Florence-2 in {dtype}: {e}")
+
+def load_florence(model_id, attn_implementation):
+    """Load Florence-2 for inference with the given attention backend, int8-quantized if configured"""
+    if FLORENCE_QUANTIZATION == "int8" and device == "cuda":
+        # bitsandbytes places the quantized weights itself, so no .to(device)
+        from transformers import BitsAndBytesConfig
+        return AutoModelForCausalLM.from_pretrained(
+            model_id,
+            trust_remote_code=True,
+            attn_implementation=attn_implementation,
+            dtype=dtype,
+            device_map={"": 0},
+            # Only the language model is bandwidth-bound per token; keep the vision tower in full precision
+            quantization_config=BitsAndBytesConfig(load_in_8bit=True, llm_int8_skip_modules=["vision_tower"])
+        ).eval()
+    return AutoModelForCausalLM.from_pretrained(
+        model_id,
+        trust_remote_code=True,
+        attn_implementation=attn_implementation,
+        dtype=dtype
+    ).to(device).eval()
+
+def florence_encode_image(pixel_values):
+    """Run only Florence-2's vision encoder and projection; called from a worker thread"""
+    with on_stream(florence_stream), torch.inference_mode(), autocast():
+        return florence_model._encode_image(pixel_values)
+
+def get_florence_features(cache_key):
+    """Cached vision features for cache_key (marking them recently used), or None"""
+    image_features = florence_feature_cache.get(cache_key)
+    if image_features is not None:
+        florence_feature_cache.move_to_end(cache_key)
+    return image_features
+
+def put_florence_features(cache_key, image_features):
+    """Cache vision features, evicting least recently used entries past the byte budget"""
+    global florence_feature_cache_bytes
+    if cache_key in florence_feature_cache:
+        return
+    florence_feature_cache[cache_key] = image_features
+    florence_feature_cache_bytes += image_features.nbytes
+    while florence_feature_cache_bytes > FLORENCE_FEATURE_CACHE_BYTES and florence_feature_cache:
+        _, evicted = florence_feature_cache.popitem(last=False)
+        florence_feature_cache_bytes -= evicted.nbytes
+
+def get_florence_result(result_key):
+    """Cached parsed answer for result_key (marking it recently used), or None"""
+    result = florence_result_cache.get(result_key)
+    if result is not None:
+        florence_result_cache.move_to_end(result_key)
+    return result
+
+def put_florence_result(result_key, result):
+    florence_result_cache[result_key] = result
+    florence_result_cache.move_to_end(result_key)
+    if len(florence_result_cache) > FLORENCE_RESULT_CACHE_SIZE:
+        florence_result_cache.popitem(last=False)
+
+def florence_generate_batch(input_ids, image_features, task=None, **generate_kwargs):
+    """Run Florence-2 generate() on a stacked batch with task's FLORENCE_GEN_CFG; called from a worker thread"""
+    generate_kwargs = {**FLORENCE_GEN_CFG.get(task, FLORENCE_DEFAULT_GEN_CFG), **generate_kwargs}
+    global florence_use_cache
+
+    # Same merge the remote generate() does for pixel_values, but from
+    # precomputed (possibly cached) image features
+    with on_stream(florence_stream), torch.inference_mode(), autocast():
+        inputs_embeds = florence_model.get_input_embeddings()(input_ids)
+        inputs_embeds, _ = florence_model._merge_input_ids_with_image_features(image_features, inputs_embeds)
+
+    # With the KV cache each decode step attends over cached keys
+    # instead of recomputing the whole prefix.
+    def generate(use_cache):
+        # inference_mode rather than generate()'s own no_grad, matching the
+        # (inference-mode) features it consumes
+        with on_stream(florence_stream), torch.inference_mode(), autocast():
+            return florence_model.generate(
+                input_ids=input_ids,
+                inputs_embeds=inputs_embeds,
+                use_cache=use_cache,
+                **generate_kwargs
+            )
+
+    try:
+        return generate(florence_use_cache)
+    except AttributeError as e:
+        # Some transformers releases hand the remote code a None
+        # past_key_values ("'NoneType' object has no attribute ..."); fall
+        # back to uncached decoding for good. Anything else is a real error.
+        if not florence_use_cache or "'NoneType' object" not in str(e):
+            raise
+        logger.warning(f"Florence KV cache unsupported, disabling it: {e}")
+        florence_use_cache = False
+        return generate(False)
+
+async def florence_batcher():
+    """
+    Drain florence_queue like yolo_batcher and decode each batch with one
+    generate() call. Florence-2 builds an all-ones attention mask over the
+    image and prompt tokens itself, so padded prompts would be attended to;
+    instead only prompts of the same token length (and task, which sets the
+    generation config) share a forward pass.
+    """
+    while True:
+        items = await collect_batch(florence_queue, FLORENCE_MAX_BATCH, FLORENCE_BATCH_WINDOW)
+        groups = {}
+        for item in items:
+            groups.setdefault((item[2], item[0].shape[-1]), []).append(item)
+        for (task, _), group in groups.items():
+            try:
+                # Off the event loop so Qwen/YOLO requests can run on their streams meanwhile
+                generated_ids = await asyncio.get_running_loop().run_in_executor(
+                    florence_executor,
+                    florence_generate_batch,
+                    torch.cat([input_ids for input_ids, _, _, _ in group]),
+                    torch.cat([image_features for _, image_features, _, _ in group]),
+                    task
+                )
+                # Structured tasks keep their <loc_*>/<poly> special tokens for
+                # post_process_generation to parse into coordinates
+                texts = florence_processor.batch_decode(
+                    generated_ids, skip_special_tokens=task not in FLORENCE_STRUCTURED_TASKS
+                )
+            except Exception as e:
+                for _, _, _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, _, _, future), text in zip(group, texts):
+                if not future.done():
+                    future.set_result(text)
+
+async def run_florence(input_ids, image_features, task=None):
+    """Queue one prompt/image-features pair (batch size 1, on the device) for batched Florence-2 generation; returns the decoded text"""
+    future = asyncio.get_running_loop().create_future()
+    await florence_queue.put((input_ids, image_features, task, future))
+    return await future
+
+async def stream_florence_analysis(image, task, prompt, cache_key=None):
+    """
+    Run Florence-2 on one CHW device crop and stream the decoded text as
+    Server-Sent Events: one JSON-string data event per chunk, an error event
+    carrying the message if generation fails, then a done event. Bypasses the
+    batcher since the streamer handles a single sequence.
+    """
+    image_features = get_florence_features(cache_key) if cache_key is not None else None
+    if image_features is None:
+        with torch.inference_mode():
+            pixel_values = florence_pixel_values(image)
+        image_features = await asyncio.get_running_loop().run_in_executor(florence_executor, florence_encode_image, pixel_values)
+        if cache_key is not None:
+            put_florence_features(cache_key, image_features)
+
+    streamer = TextIteratorStreamer(florence_processor.tokenizer, skip_special_tokens=True)
+    # Set by the worker before it ends the streamer, so events() sees it once
+    # the chunk iterator stops
+    errors = []
+
+    def generate():
+        try:
+            florence_generate_batch(florence_input_ids(prompt), image_features, task, streamer=streamer)
+        except Exception as e:
+            logger.error(f"Streaming generation failed: {e}")
+            errors.append(str(e))
+            # Unblock the response iterator
+            streamer.end()
+
+    florence_executor.submit(generate)
+
+    def events():
+        for chunk in streamer:
+            if chunk:
+                yield f"data: {orjson.dumps(chunk).decode()}\n\n"
+        for error in errors:
+            yield f"event: error\ndata: {orjson.dumps(error).decode()}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+async def warmup_florence_tasks():
+    """
+    Run one request-path analysis (device crop -> encoder -> batcher ->
+    generate) per Florence-2 task on a blank image, so cuDNN autotuning and
+    compiled-graph capture for every task happen before the first real request
+    """
+    blank = torch.zeros((3, 768, 768), dtype=torch.uint8, device=device)
+    for task in dict.fromkeys(TASKS):
+        prompt = REQUESTS[TASKS.index(task)]
+        await run_florence_analysis(blank, task, prompt=prompt)
+    logger.info("Florence-2 task warm-up complete")
+
+def warmup_memory_pool():
+    """
+    Run one realistic-sized pass through each model so the caching allocator
+    reserves its blocks up front, then log the allocator state
+    """
+    if device != "cuda":
+        return
+    def warmup_qwen():
+        inputs = summarizer_tokenizer("warm-up " * 32, return_tensors="pt").to(summarizer_model.device)
+        with torch.inference_mode(), on_stream(qwen_stream), autocast():
+            summarizer_model.generate(**inputs, max_new_tokens=64, do_sample=False)
+
+    def warmup_florence_inference():
+        with torch.inference_mode():
+            warmup_florence()
+
+    try:
+        with torch.inference_mode():
+            yolo_predict([to_device_image(np.zeros((224, 224, 3), dtype=np.uint8))], verbose=False)
+        # Generative models only ever run on their own worker threads
+        florence_executor.submit(warmup_florence_inference).result()
+        if summarizer_model is not None:
+            qwen_executor.submit(warmup_qwen).result()
+        logger.info(f"CUDA memory after warm-up:\n{torch.cuda.memory_summary(abbreviated=True)}")
+    except Exception as e:
+        logger.warning(f"Memory pool warm-up failed: {e}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    global yolo_model, florence_model, florence_processor, summarizer_model, summarizer_tokenizer
+    global yolo_model, florence_model, florence_processor, summarizer_model, summarizer_tokenizer, yolo_queue
+    global florence_queue
+    global http_client, yolo_stream, florence_stream, qwen_stream
+    batcher_task = None
+    florence_batcher_task = None
+    http_client = httpx.AsyncClient(timeout=10, http2=True, follow_redirects=True)
     try:
+        if device == "cuda":
+            # Leave headroom for the driver/display so we hit a clean OOM rather than thrash
+            torch.cuda.set_per_process_memory_fraction(0.9)
+            torch.cuda.empty_cache()
+            yolo_stream, florence_stream, qwen_stream = (torch.cuda.Stream() for _ in range(3))
+
         # Load YOLO first and be EXPLICIT about the device to avoid CPU fallback
         logger.info("Loading YOLO11x model...")
         yolo_model = YOLO('yolo11x.pt')
         yolo_model.to(device)
+        # Detections are looked up by class id in object_config, which assumes COCO ordering
+        if tuple(yolo_model.names.values()) != COCO_ID_TO_NAME:
+            logger.warning("YOLO class names do not match COCO order; object config lookups will be wrong")
         logger.info(f"YOLO11x model loaded successfully on {device}")
+        yolo_queue = asyncio.Queue()
+        batcher_task = asyncio.create_task(yolo_batcher())
 
         # Load Qwen2.5-0.5B-Instruct for extreme speed on RTX 4070 Super.
         # At 0.5B params in FP16, it uses ~1.1GB VRAM and generates almost instantly.
@@ -58,26 +669,61 @@ async def lifespan(app: FastAPI):
         summarizer_model_id = 'Qwen/Qwen2.5-0.5B-Instruct'
         
         summarizer_tokenizer = AutoTokenizer.from_pretrained(summarizer_model_id)
+        chat_template_ids(DEFAULT_SYSTEM_PROMPT)
         summarizer_model = AutoModelForCausalLM.from_pretrained(
             summarizer_model_id,
             trust_remote_code=True,
-            torch_dtype=torch.float16,
+            torch_dtype=dtype,
             device_map="auto"
+        ).eval().requires_grad_(False)
+        # Set once so generate() doesn't fall back to eos with a warning on every call
+        summarizer_model.generation_config.pad_token_id = (
+            summarizer_tokenizer.pad_token_id
+            if summarizer_tokenizer.pad_token_id is not None
+            else summarizer_tokenizer.eos_token_id
+        )
+        # generate() drives model.forward, so that is what gets compiled
+        # Compiled and warmed up on the thread that will serve it
+        await asyncio.get_running_loop().run_in_executor(
+            qwen_executor, compile_with_warmup, summarizer_model, "Qwen2.5-0.5B-Instruct", warmup_summarizer
         )
         logger.info("Qwen2.5-0.5B-Instruct loaded successfully")
 
         # Load Florence-2 last as it's the largest single-block model
         logger.info("Loading Florence-2-large model...")
         florence_model_id = 'microsoft/Florence-2-large'
-        florence_model = AutoModelForCausalLM.from_pretrained(
-            florence_model_id, 
-            trust_remote_code=True,
-            attn_implementation="eager",
-            dtype=dtype
-        ).to(device).eval()
-        florence_processor = AutoProcessor.from_pretrained(florence_model_id, trust_remote_code=True)
+        try:
+            # SDPA dispatches to fused FlashAttention/memory-efficient kernels
+            # instead of materializing the attention matrix
+            florence_model = load_florence(florence_model_id, "sdpa")
+        except (ValueError, ImportError, AttributeError) as e:
+            # Florence-2's remote code predates SDPA support: transformers either
+            # rejects it (ValueError) or trips over the missing _supports_sdpa
+            # attribute (AttributeError), depending on the release
+            logger.warning(f"SDPA attention unavailable for Florence-2, using eager: {e}")
+            florence_model = load_florence(florence_model_id, "eager")
+        if FLORENCE_QUANTIZATION == "fp8" and device == "cuda":
+            quantize_florence_fp8()
+        # Inference only: no parameter ever needs autograd tracking
+        florence_model.requires_grad_(False)
+        florence_processor = AutoProcessor.from_pretrained(florence_model_id, trust_remote_code=True, use_fast=True)
+        if not getattr(florence_processor.tokenizer, "is_fast", False):
+            logger.warning("Florence-2 is using the slow Python tokenizer; install `tokenizers` for the Rust one")
+        # Pre-tokenize every configured prompt so requests never hit the tokenizer
+        for prompt in dict.fromkeys(REQUESTS):
+            florence_input_ids(prompt)
+        # Florence-2's generate() encodes the image once, then decodes through its language model
+        await asyncio.get_running_loop().run_in_executor(
+            florence_executor, compile_with_warmup,
+            getattr(florence_model, "language_model", florence_model), "Florence-2", warmup_florence
+        )
+        florence_queue = asyncio.Queue()
+        florence_batcher_task = asyncio.create_task(florence_batcher())
         logger.info("Florence-2 model loaded successfully")
-        
+        await warmup_florence_tasks()
+
+        warmup_memory_pool()
+
         yield
     except Exception as e:
         logger.error(f"Failed to load models: {e}")
@@ -88,13 +734,35 @@ async def lifespan(app: FastAPI):
         else:
             raise
     # Shutdown
+    for task in (batcher_task, florence_batcher_task):
+        if task is not None:
+            task.cancel()
+    await http_client.aclose()
+    for executor in (florence_executor, qwen_executor):
+        executor.shutdown(wait=False, cancel_futures=True)
     logger.info("Shutting down Ultralytics server")
 
+async def json_body(http_request: Request) -> Dict[str, Any]:
+    """Parse a JSON object request body with orjson (faster than the default json.loads on multi-MB base64 payloads)"""
+    try:
+        body = orjson.loads(await http_request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=422, detail="Request body must be a JSON object")
+    return body
+
+class DetectionResponse(ORJSONResponse):
+    """orjson response that also serializes numpy scalars/arrays natively"""
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
 app = FastAPI(
     title="Ultralytics YOLO Detection API",
     description="Object detection API using YOLO11 models",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware to allow requests from browser
@@ -135,10 +803,11 @@ async def get_status():
 @app.get("/api/config/objects")
 async def get_object_config():
     """Get the full object configuration for the frontend"""
-    return OBJECT_CONFIG
+    # Serve the JSON asset verbatim instead of re-encoding 80 dicts per call
+    return Response(content=object_config.load_object_config_json(), media_type="application/json")
 
 @app.post("/api/save-image")
-async def save_image(request: Dict[str, Any]):
+async def save_image(request: Dict[str, Any] = Depends(json_body)):
     """
     Save image from base64 data or URL to the images directory
 
@@ -165,12 +834,10 @@ async def save_image(request: Dict[str, Any]):
         # Get image data
         if image_data:
             # Decode base64
-            image_bytes = base64.b64decode(image_data)
+            image_bytes = await b64decode_async(image_data)
         else:
             # Download from URL
-            response = requests.get(image_url, timeout=10)
-            response.raise_for_status()
-            image_bytes = response.content
+            image_bytes = await download_image(image_url)
 
         # Open and validate image
         image = Image.open(io.BytesIO(image_bytes))
@@ -178,8 +845,8 @@ async def save_image(request: Dict[str, Any]):
 
         # Generate filename if not provided
         if not filename:
-            # Create hash of image content for deduplication
-            image_hash = hashlib.md5(image_bytes).hexdigest()[:8]
+            # Create hash of image content for deduplication (non-cryptographic is fine here)
+            image_hash = xxhash.xxh3_64_hexdigest(image_bytes)[:8]
             filename = f"{image_hash}_{image.size[0]}x{image.size[1]}.{image_format.lower()}"
         elif not filename.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp')):
             filename = f"{filename}.{image_format.lower()}"
@@ -206,7 +873,7 @@ async def save_image(request: Dict[str, Any]):
             "size": len(image_bytes)
         }
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Failed to download image: {e}")
         raise HTTPException(status_code=400, detail=f"Failed to download image: {str(e)}")
     except Exception as e:
@@ -232,38 +899,24 @@ async def detect_objects(file: UploadFile = File(...)):
     try:
         # Read and validate image
         image_data = await file.read()
-        image = Image.open(io.BytesIO(image_data))
-
-        # Convert PIL to numpy array for YOLO
-        image_np = np.array(image)
+        # Decoded straight into device memory; YOLO letterboxes from it and Florence crops from it
+        image_gpu = decode_image_to_device(image_data)
 
         # Run YOLO detection
-        results = yolo_model(image_np)
+        results = await run_yolo(image_gpu)
 
         # Process results - SHOW ALL OBJECTS
         detections = []
+        img_height, img_width = image_gpu.shape[-2:]
         for result in results:
             boxes = result.boxes
             if boxes is not None:
-                for box in boxes:
-                    # Get confidence and class
-                    confidence = float(box.conf[0].cpu().numpy())
-                    class_id = int(box.cls[0].cpu().numpy())
-                    class_name = yolo_model.names[class_id]
-                    # Get bounding box coordinates
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-
-                    # Convert to percentage coordinates (0-100)
-                    img_height, img_width = image_np.shape[:2]
+                _, bbox_pct, confidences, class_ids = yolo_boxes_to_arrays(boxes, img_width, img_height)
+                for (x1, y1, x2, y2), confidence, class_id in zip(bbox_pct, confidences, class_ids):
                     detection = {
-                        "class": class_name,
-                        "confidence": float(round(confidence, 3)),
-                        "bbox": {
-                            "x1": float(round((x1 / img_width) * 100, 2)),
-                            "y1": float(round((y1 / img_height) * 100, 2)),
-                            "x2": float(round((x2 / img_width) * 100, 2)),
-                            "y2": float(round((y2 / img_height) * 100, 2))
-                        }
+                        "class": COCO_ID_TO_NAME[class_id],
+                        "confidence": confidence,
+                        "bbox": {"x1": x1, "y1": y1, "x2": x2, "y2": y2}
                     }
                     detections.append(detection)
 
@@ -274,22 +927,47 @@ async def detect_objects(file: UploadFile = File(...)):
         }
 
         logger.info(f"Detection completed: {len(detections)} objects found")
-        return response
+        # Returned as a Response so FastAPI skips the jsonable_encoder walk over every box
+        return DetectionResponse(response)
 
     except Exception as e:
         logger.error(f"Detection error: {e}")
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
 
-@app.post("/api/detect-base64")
-async def detect_objects_base64(request: Dict[str, Any]):
+async def detect_image_bytes(image_bytes, light, source):
+    """
+    Shared body of the detect-base64/bin/url endpoints: decode the encoded
+    image to the device, run YOLO only and wrap process_detections output
+    """
+    # Decoded straight into the device tensor YOLO consumes
+    image_gpu = decode_image_to_device(image_bytes)
+    results = await run_yolo(image_gpu)
+    detections = await process_detections(image_gpu, results, deep_analysis=False, light=light)
+
+    response = {
+        "type": "detection",
+        "data": detections,
+        "total_objects": len(detections)
+    }
+
+    logger.info(f"{source} YOLO detection completed: {len(detections)} objects found")
+    # Returned as a Response so FastAPI skips the jsonable_encoder walk over every box
+    return DetectionResponse(response)
+
+@app.post("/api/detect-base64", deprecated=True)
+async def detect_objects_base64(request: Dict[str, Any] = Depends(json_body), light: bool = False):
     """
     Detect objects in base64 encoded image using YOLO11
 
     Expects:
     - JSON with 'image' field containing base64 encoded image data
+    - ?light=1 to return only geometry, type and confidence per object
 
     Returns:
     - JSON with detected objects, bounding boxes, confidence scores, and class names
+
+    Deprecated: prefer the multipart /api/detect-bin upload, which returns the
+    same detections without the base64 payload overhead and decode.
     """
     global yolo_model
 
@@ -302,52 +980,54 @@ async def detect_objects_base64(request: Dict[str, Any]):
         if not image_data:
             raise HTTPException(status_code=400, detail="No image data provided")
 
-        # Decode base64
-        image_bytes = base64.b64decode(image_data)
-        image = Image.open(io.BytesIO(image_bytes))
+        image_bytes = await b64decode_async(image_data)
 
         # Save captured image if requested or for debugging
         if request.get("save", False):
-            images_dir = Path("images")
-            images_dir.mkdir(exist_ok=True)
-            image_hash = hashlib.md5(image_bytes).hexdigest()[:8]
-            filename = f"scan_{image_hash}.jpg"
-            save_path = images_dir / filename
-            
-            if not save_path.exists():
-                with open(save_path, "wb") as f:
-                    f.write(image_bytes)
-                logger.info(f"Saved scanned image to {save_path}")
+            save_scanned_image(image_bytes)
 
-        # Convert PIL to numpy array for YOLO
-        image_np = np.array(image)
+        return await detect_image_bytes(image_bytes, light, "Base64")
 
-        # Run YOLO detection
-        results = yolo_model(image_np)
+    except Exception as e:
+        logger.error(f"Base64 detection error: {e}")
+        raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
 
-        # Process results fast - only YOLO
-        detections = await process_detections(image, results, deep_analysis=False)
+@app.post("/api/detect-bin")
+async def detect_objects_bin(file: UploadFile = File(...), save: bool = Form(False), light: bool = False):
+    """
+    Detect objects in an image sent as multipart/form-data using YOLO11
 
-        response = {
-            "type": "detection",
-            "data": detections,
-            "total_objects": len(detections)
-        }
+    Expects:
+    - 'file': raw image bytes (JPEG, PNG, etc.)
+    - 'save': true to keep a copy under images/ (optional)
+    - ?light=1 to return only geometry, type and confidence per object
+
+    Returns:
+    - The same detections as /api/detect-base64
+    """
+    if yolo_model is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
 
-        logger.info(f"Base64 YOLO detection completed: {len(detections)} objects found")
-        return response
+    try:
+        image_bytes = await file.read()
+
+        if save:
+            save_scanned_image(image_bytes)
+
+        return await detect_image_bytes(image_bytes, light, "Multipart")
 
     except Exception as e:
-        logger.error(f"Base64 detection error: {e}")
+        logger.error(f"Multipart detection error: {e}")
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
 
 @app.post("/api/detect-url")
-async def detect_objects_url(request: Dict[str, Any]):
+async def detect_objects_url(request: Dict[str, Any] = Depends(json_body), light: bool = False):
     """
     Detect objects in image from URL using YOLO11
 
     Expects:
     - JSON with 'url' field containing image URL
+    - ?light=1 to return only geometry, type and confidence per object
 
     Returns:
     - JSON with detected objects, bounding boxes, confidence scores, and class names
@@ -364,57 +1044,52 @@ async def detect_objects_url(request: Dict[str, Any]):
             raise HTTPException(status_code=400, detail="No image URL provided")
 
         # Download image from URL
-        response = requests.get(image_url, timeout=10)
-        response.raise_for_status()
+        image_bytes = await download_image(image_url)
 
-        # Open image
-        image = Image.open(io.BytesIO(response.content))
-
-        # Convert PIL to numpy array for YOLO
-        image_np = np.array(image)
-
-        # Run YOLO detection
-        results = yolo_model(image_np)
+        return await detect_image_bytes(image_bytes, light, "URL")
 
-        # Process results fast - only YOLO
-        detections = await process_detections(image, results, deep_analysis=False)
-
-        response = {
-            "type": "detection",
-            "data": detections,
-            "total_objects": len(detections)
-        }
-
-        logger.info(f"URL YOLO detection completed: {len(detections)} objects found")
-        return response
-
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Failed to download image: {e}")
         raise HTTPException(status_code=400, detail=f"Failed to download image: {str(e)}")
     except Exception as e:
         logger.error(f"URL detection error: {e}")
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
 
-@app.post("/api/analyze-box")
-async def analyze_box(request: Dict[str, Any]):
-    """
-    Run deep analysis on a specific box within an image
-    """
-    global florence_model, florence_processor
-    
-    if florence_model is None:
-        raise HTTPException(status_code=503, detail="VLM not loaded")
+def save_scanned_image(image_bytes):
+    """Write a scanned image to images/ under its content hash, once"""
+    images_dir = Path("images")
+    images_dir.mkdir(exist_ok=True)
+    image_hash = xxhash.xxh3_64_hexdigest(image_bytes)[:8]
+    save_path = images_dir / f"scan_{image_hash}.jpg"
 
-    try:
-        image_data = request.get("image")
-        box = request.get("box") # {x, y, width, height} in percentages
-        
-        if not image_data or not box:
-            raise HTTPException(status_code=400, detail="Missing image data or box coordinates")
+    if not save_path.exists():
+        with open(save_path, "wb") as f:
+            f.write(image_bytes)
+        logger.info(f"Saved scanned image to {save_path}")
 
-        image_bytes = base64.b64decode(image_data)
-        image = Image.open(io.BytesIO(image_bytes))
-        img_width, img_height = image.size
+async def analyze_crop(image_bytes, box, obj_type, stream=False):
+    """
+    Crop box ({x, y, width, height} in percentages) out of the encoded image
+    and run the Florence-2 prompt configured for obj_type on it. With stream,
+    returns an SSE StreamingResponse of the raw decoded text instead.
+    """
+    # Mapping for targeted questions from centralized config.
+    # REQUESTS already holds the final prompt; for <DETAILED_CAPTION> it is
+    # the bare token, since the processor fails if any text follows it.
+    class_id = COCO_NAME_TO_ID.get(obj_type)
+    if class_id is not None:
+        task, prompt = TASKS[class_id], REQUESTS[class_id]
+    else:
+        task, prompt = DETAILED_CAPTION, DETAILED_CAPTION
+
+    # Identical re-asks are answered from the result cache before any decoding
+    image_hash = xxhash.xxh3_64_intdigest(image_bytes)
+    result_key = (image_hash, (box['x'], box['y'], box['width'], box['height']), prompt)
+    florence_results = None if stream else get_florence_result(result_key)
+
+    if florence_results is None:
+        image_gpu = decode_image_to_device(image_bytes)
+        img_height, img_width = image_gpu.shape[-2:]
 
         # Convert percentages to pixels
         x = (box['x'] / 100) * img_width
@@ -428,49 +1103,100 @@ async def analyze_box(request: Dict[str, Any]):
         cy1 = max(0, int(y) - pad)
         cx2 = min(img_width, int(x + w) + pad)
         cy2 = min(img_height, int(y + h) + pad)
-        cropped_image = image.crop((cx1, cy1, cx2, cy2))
-        
-        # Determine the best prompt based on object type
-        obj_type = request.get("type", "person")
+        # Degenerate boxes (e.g. entirely off-image) would be upscaled from a
+        # sliver into a meaningless 768x768 encoder input
+        if cx2 - cx1 < 16 or cy2 - cy1 < 16:
+            logger.warning(f"Crop too small: {(cx2 - cx1, cy2 - cy1)}")
+            return {"analysis": "Crop too small"}
+        # Crop on the device; Florence's resize/normalize happens there too
+        cropped_image = image_gpu[:, cy1:cy2, cx1:cx2]
+
         logger.info(f"Analyzing box: type={obj_type}, size={int(w)}x{int(h)}")
-        
-        # Mapping for targeted questions from centralized config
-        config = OBJECT_CONFIG.get(obj_type, {
-            "task": "<DETAILED_CAPTION>",
-            "prompt": "",
-            "llm_query": f"Analyze object: {obj_type}."
-        })
-        
-        task = config["task"]
-        hint = config["prompt"]
-        
-        # CRITICAL: For <DETAILED_CAPTION>, the token MUST be the only text.
-        # Otherwise the processor fails.
-        if task == "<DETAILED_CAPTION>":
-            hint = ""
-        
+
+        cache_key = (image_hash, (cx1, cy1, cx2, cy2))
+        if stream:
+            return await stream_florence_analysis(cropped_image, task, prompt, cache_key=cache_key)
+
         # For standard captioning tasks, extra text hints can sometimes cause errors
         # in some model versions, so we use VQA when a question is needed.
-        florence_results = await run_florence_analysis(cropped_image, task, text_input=hint)
+        florence_results = await run_florence_analysis(
+            cropped_image, task, prompt=prompt, cache_key=cache_key, result_key=result_key
+        )
+    else:
+        logger.info(f"Analysis cache hit: type={obj_type}")
+    
+    analysis_text = ""
+    # Handle results based on task type
+    if task == VQA:
+        analysis_text = florence_results.get(VQA, "No answer")
+    elif task in florence_results:
+        analysis_text = florence_results[task]
+    else:
+        # Fallback to any result
+        analysis_text = next(iter(florence_results.values())) if florence_results else "No analysis result"
         
-        analysis_text = ""
-        # Handle results based on task type
-        if task == "<VQA>":
-            analysis_text = florence_results.get("<VQA>", "No answer")
-        elif task in florence_results:
-            analysis_text = florence_results[task]
-        else:
-            # Fallback to any result
-            analysis_text = next(iter(florence_results.values())) if florence_results else "No analysis result"
-            
-        return {"analysis": analysis_text}
+    return {"analysis": analysis_text}
+
+@app.post("/api/analyze-box", deprecated=True)
+async def analyze_box(request: Dict[str, Any] = Depends(json_body)):
+    """
+    Run deep analysis on a specific box within an image
+
+    Florence-2 decodes greedily with a per-task token cap (see FLORENCE_GEN_CFG).
+    Pass "stream": true to receive the text as Server-Sent Events while it decodes.
+
+    Deprecated: base64 JSON adds a third to the payload and a decode on every
+    call; prefer /api/analyze-box-bin.
+    """
+    global florence_model, florence_processor
+    
+    if florence_model is None:
+        raise HTTPException(status_code=503, detail="VLM not loaded")
+
+    try:
+        image_data = request.get("image")
+        box = request.get("box") # {x, y, width, height} in percentages
+        
+        if not image_data or not box:
+            raise HTTPException(status_code=400, detail="Missing image data or box coordinates")
+
+        image_bytes = await b64decode_async(image_data)
+        # Determine the best prompt based on object type
+        return await analyze_crop(image_bytes, box, request.get("type", "person"), stream=request.get("stream", False))
+
+    except Exception as e:
+        logger.error(f"Crop analysis failed: {e}")
+        return {"analysis": f"Error: {str(e)[:50]}"}
+
+@app.post("/api/analyze-box-bin")
+async def analyze_box_bin(
+    file: UploadFile = File(...),
+    box: str = Form(...),
+    type: str = Form("person"),
+    stream: bool = Form(False)
+):
+    """
+    Run deep analysis on a specific box within an image, sent as multipart/form-data
+
+    Expects:
+    - 'file': raw image bytes (JPEG, PNG, etc.)
+    - 'box': JSON {x, y, width, height} in percentages
+    - 'type': detected class name (optional, defaults to person)
+    - 'stream': true to get the text as Server-Sent Events while it decodes (optional)
+    """
+    if florence_model is None:
+        raise HTTPException(status_code=503, detail="VLM not loaded")
+
+    try:
+        image_bytes = await file.read()
+        return await analyze_crop(image_bytes, orjson.loads(box), type, stream=stream)
 
     except Exception as e:
         logger.error(f"Crop analysis failed: {e}")
         return {"analysis": f"Error: {str(e)[:50]}"}
 
 @app.post("/api/summarize")
-async def summarize_text(request: Dict[str, Any]):
+async def summarize_text(request: Dict[str, Any] = Depends(json_body)):
     """
     Summarize text using Qwen2.5-0.5B-Instruct
     """
@@ -493,18 +1219,13 @@ async def summarize_text(request: Dict[str, Any]):
         category = request.get("category", "Misc")
         obj_type = request.get("type")
         
-        # Base system prompt for Qwen - Neutral and performance-oriented
-        system_prompt = request.get("system_prompt") or (
-            "You are the AI Scanner OS. Direct, cold, and factual. "
-            "Skip all 'thinking' and preamble. Do not use phrases like 'The image shows' or 'Here is a summary'. "
-            "Output only the final analytical data."
-        )
+        system_prompt = request.get("system_prompt") or DEFAULT_SYSTEM_PROMPT
         
         # Prepare content based on mode
         if mode == "refine":
             # Get class-specific prompt from OBJECT_CONFIG if available
-            obj_config = OBJECT_CONFIG.get(obj_type, {}) if obj_type else {}
-            hint = obj_config.get("llm_query") or obj_config.get("prompt")
+            class_id = COCO_NAME_TO_ID.get(obj_type) if obj_type else None
+            hint = LLM_REQUESTS[class_id] if class_id is not None else None
             
             if not hint:
                 # Specialized prompt for refining Florence-2/Vision output
@@ -534,40 +1255,35 @@ async def summarize_text(request: Dict[str, Any]):
                 "3. Finally write the 30-100 word summary about the SOURCE TEXT."
             )
 
-        # Use chat template for robust prompting
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": query}
-        ]
-        prompt = summarizer_tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
-        
-        inputs = summarizer_tokenizer(prompt, return_tensors="pt").to(summarizer_model.device)
-        
-        # Define stopping criteria to check for cancellation
-        from transformers import StoppingCriteria, StoppingCriteriaList
-        
-        class CancelCriteria(StoppingCriteria):
-            def __init__(self, target_id):
-                self.target_id = target_id
-            def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> bool:
-                # If a new request has started, stop this one
-                return current_summarize_id != self.target_id
-
-        with torch.no_grad():
-            output_ids = summarizer_model.generate(
-                **inputs,
-                max_new_tokens=256,
-                do_sample=False,  # Greedy search for maximum speed
-                num_beams=1,
-                stopping_criteria=StoppingCriteriaList([CancelCriteria(current_id)])
-            )
+        # Use chat template for robust prompting; the template around the
+        # query is tokenized once per system prompt and reused
+        prefix_ids, suffix_ids = chat_template_ids(system_prompt)
+        input_ids = torch.tensor(
+            [prefix_ids + list(query_ids(query)) + suffix_ids], device=summarizer_model.device
+        )
+
+        def generate():
+            # Grad mode, autocast and the current stream are thread-local, so set them in the worker.
+            # inference_mode also skips autograd version-counter bookkeeping
+            with on_stream(qwen_stream), torch.inference_mode(), autocast():
+                return summarizer_model.generate(
+                    input_ids=input_ids,
+                    attention_mask=torch.ones_like(input_ids),
+                    max_new_tokens=256,
+                    do_sample=False,  # Greedy search for maximum speed
+                    num_beams=1,
+                    stopping_criteria=StoppingCriteriaList([CancelCriteria(current_id)])
+                )
+
+        # Off the event loop so Florence/YOLO requests can run on their streams meanwhile
+        output_ids = await asyncio.get_running_loop().run_in_executor(qwen_executor, generate)
         
         # Check if we were cancelled
         if current_summarize_id != current_id:
             logger.info(f"Summarization request {current_id} cancelled")
             return {"summary": "[Request cancelled by a newer one]", "cancelled": True}
             
-        summary = summarizer_tokenizer.decode(output_ids[0][inputs.input_ids.shape[1]:], skip_special_tokens=True)
+        summary = summarizer_tokenizer.decode(output_ids[0][input_ids.shape[1]:], skip_special_tokens=True)
         return {"summary": summary.strip()}
 
     except Exception as e:
@@ -586,43 +1302,20 @@ async def list_images():
     image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
 
     image_files = []
-    for file_path in images_dir.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-            image_files.append({
-                "name": file_path.name,
-                "src": f"images/{file_path.name}",
-                "size": file_path.stat().st_size
-            })
+    # scandir entries carry the file type from the directory read and cache their stat
+    with os.scandir(images_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in image_extensions:
+                image_files.append({
+                    "name": entry.name,
+                    "src": f"images/{entry.name}",
+                    "size": entry.stat().st_size
+                })
     return {"images": image_files}
 
-@app.options("/images/{image_name}")
-async def options_image(image_name: str):
-    """Handle CORS preflight requests for images"""
-    return JSONResponse(
-        status_code=200,
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-            "Access-Control-Allow-Headers": "*",
-        }
-    )
-
-@app.get("/images/{image_name}")
-async def get_image(image_name: str):
-    """Serve image files with CORS headers"""
-    image_path = Path("images") / image_name
-
-    if not image_path.exists():
-        raise HTTPException(status_code=404, detail="Image not found")
-
-    return FileResponse(
-        image_path,
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-            "Access-Control-Allow-Headers": "*",
-        }
-    )
+# Saved images are served by StaticFiles; CORS headers and preflights come from CORSMiddleware
+Path("images").mkdir(exist_ok=True)
+app.mount("/images", StaticFiles(directory="images"), name="images")
 
 @app.get("/api/models")
 def get_available_models():
@@ -642,24 +1335,50 @@ def get_available_models():
         "note": "Restart server to change model"
     }
 
-async def process_detections(image, results, deep_analysis=False):
-    """Helper to process YOLO results and optionally run Florence-2 analysis"""
+def yolo_boxes_to_arrays(boxes, img_width, img_height):
+    """
+    Scale and round a YOLO Boxes batch on its own device, then move everything
+    to the CPU in a single transfer. Returns (xyxy, bbox_pct, confidences,
+    class_ids) as plain Python lists, where bbox_pct holds the corners as 0-100
+    percentages of the image size. .tolist() builds all the floats in one C
+    loop, so callers can use them as-is.
+    """
+    # FP64 so the rounded values survive .tolist() as clean 2/3-decimal floats;
+    # rounding in FP32 leaves widening noise like 12.34000015258789
+    data = boxes.data.double()
+    xyxy = data[:, :4]
+    scale = torch.tensor(
+        [100.0 / img_width, 100.0 / img_height, 100.0 / img_width, 100.0 / img_height],
+        dtype=data.dtype, device=data.device
+    )
+    # Columns: xyxy (4), bbox_pct (4), confidence, class id
+    packed = torch.cat(
+        [xyxy, (xyxy * scale).round_(decimals=2), data[:, 4:5].round(decimals=3), data[:, 5:6]], dim=1
+    ).cpu().numpy()
+    # Plain ints so they can index tuples and shift ANALYZABLE_MASK
+    class_ids = packed[:, 9].astype(int).tolist()
+    return packed[:, :4].tolist(), packed[:, 4:8].tolist(), packed[:, 8].tolist(), class_ids
+
+async def process_detections(image_gpu, results, deep_analysis=False, light=False):
+    """
+    Helper to process YOLO results (CHW uint8 device tensor input) and optionally run Florence-2 analysis.
+    light keeps only geometry, type and confidence per object; the rest can be
+    looked up per type from /api/config/objects.
+    """
     detections = []
-    img_height, img_width = np.array(image).shape[:2]
+    img_height, img_width = image_gpu.shape[-2:]
     
     for result in results:
         boxes = result.boxes
         if boxes is not None:
-            for box in boxes:
-                confidence = float(box.conf[0].cpu().numpy())
-                class_id = int(box.cls[0].cpu().numpy())
-                class_name = yolo_model.names[class_id]
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
+            xyxy, bbox_pct, confidences, class_ids = yolo_boxes_to_arrays(boxes, img_width, img_height)
+            for (x1, y1, x2, y2), pct, confidence, class_id in zip(xyxy, bbox_pct, confidences, class_ids):
+                class_name = COCO_ID_TO_NAME[class_id]
 
-                # Get config for this class
-                config = OBJECT_CONFIG.get(class_name, {})
-                color = config.get("color", "#00FF00")
-                is_analyzable = config.get("is_analyzable", False)
+                # Get config for this class straight from the detector id
+                spec = SPECS[class_id]
+                color = spec.color
+                is_analyzable = bool((ANALYZABLE_MASK >> class_id) & 1)
 
                 analysis_text = ""
                 # Only attempt analysis if confidence is high (e.g., > 85%) as requested
@@ -670,11 +1389,12 @@ async def process_detections(image, results, deep_analysis=False):
                         cy1 = max(0, int(y1) - pad)
                         cx2 = min(img_width, int(x2) + pad)
                         cy2 = min(img_height, int(y2) + pad)
-                        person_image = image.crop((cx1, cy1, cx2, cy2))
+                        # Every crop is a tensor slice of the frame already on the device
+                        person_image = image_gpu[:, cy1:cy2, cx1:cx2]
                         
                         # Validate crop
-                        if person_image.width < 5 or person_image.height < 5:
-                            logger.warning(f"Crop too small: {person_image.size}")
+                        if cx2 - cx1 < 5 or cy2 - cy1 < 5:
+                            logger.warning(f"Crop too small: {(cx2 - cx1, cy2 - cy1)}")
                             analysis_text = "Crop too small"
                         else:
                             # Using just the task token to avoid 'only one token' error
@@ -694,123 +1414,113 @@ async def process_detections(image, results, deep_analysis=False):
 
                 detections.append({
                     "class": class_name,
-                    "confidence": float(round(confidence, 3)),
+                    "confidence": confidence,
                     "analysis": analysis_text,
                     "color": color, 
                     "is_analyzable": is_analyzable,
-                    "category": config.get("category", "Misc"),
-                    "bbox": {
-                        "x1": float(round((x1 / img_width) * 100, 2)),
-                        "y1": float(round((y1 / img_height) * 100, 2)),
-                        "x2": float(round((x2 / img_width) * 100, 2)),
-                        "y2": float(round((y2 / img_height) * 100, 2))
-                    }
+                    "category": spec.category.label,
+                    "bbox": {"x1": pct[0], "y1": pct[1], "x2": pct[2], "y2": pct[3]}
                 })
     
     response_data = []
     for det in detections:
-        response_data.append({
-            "x": float(det["bbox"]["x1"]),
-            "y": float(det["bbox"]["y1"]),
-            "width": float(det["bbox"]["x2"] - det["bbox"]["x1"]),
-            "height": float(det["bbox"]["y2"] - det["bbox"]["y1"]),
-            "color": det["color"],
+        item = {
+            "x": det["bbox"]["x1"],
+            "y": det["bbox"]["y1"],
+            # x/y/confidence arrive exactly rounded from yolo_boxes_to_arrays, but
+            # the difference of two rounded doubles doesn't stay rounded
+            # (55.55 - 43.21 == 12.339999999999996), so sizes are re-rounded
+            "width": round(det["bbox"]["x2"] - det["bbox"]["x1"], 2),
+            "height": round(det["bbox"]["y2"] - det["bbox"]["y1"], 2),
             "type": det["class"],
-            "analysis": det["analysis"],
-            "confidence": float(det["confidence"]),
-            "is_analyzable": det.get("is_analyzable", False),
-            "category": det.get("category", "Misc")
-        })
+            "confidence": det["confidence"]
+        }
+        if not light:
+            item.update({
+                "color": det["color"],
+                "analysis": det["analysis"],
+                "is_analyzable": det.get("is_analyzable", False),
+                "category": det.get("category", "Misc")
+            })
+        response_data.append(item)
     return response_data
 
-async def run_florence_analysis(image, task_prompt, text_input=None):
-    """Helper function to run Florence-2 analysis with robust error handling"""
+async def run_florence_analysis(image, task_prompt, prompt=None, cache_key=None, result_key=None):
+    """
+    Helper function to run Florence-2 analysis with robust error handling.
+    image is a CHW uint8 tensor already on the device; it is resized and
+    normalized there by florence_pixel_values. When cache_key identifies the
+    image (e.g. source hash + crop box), its vision features are reused
+    across calls; successful answers are cached under result_key if given.
+    prompt is the full Florence-2 prompt, defaulting to the bare task token.
+    """
     global florence_model, florence_processor
     
     try:
-        # Prompt construction
-        if text_input:
-            prompt = task_prompt + text_input
-        else:
+        if prompt is None:
             prompt = task_prompt
 
-        # Ensure RGB and valid image
-        if not image or image.width == 0 or image.height == 0:
+        image_size = (image.shape[-1], image.shape[-2])
+        if image_size[0] == 0 or image_size[1] == 0:
             return {"error": "Invalid image"}
-            
-        if image.mode != "RGB":
-            image = image.convert("RGB")
 
-        logger.info(f"Running Florence with prompt: {prompt} on image {image.size}")
+        logger.info(f"Running Florence with prompt: {prompt} on image {image_size}")
+
+        image_features = get_florence_features(cache_key) if cache_key is not None else None
 
         # Process image
-        with torch.no_grad():
-            # Use the processor to get the model inputs
+        with torch.inference_mode():
+            # Cached prompt ids, plus on-device pixel values on a feature cache miss
             try:
-                inputs = florence_processor(text=prompt, images=image, return_tensors="pt")
+                inputs = {"input_ids": florence_input_ids(prompt)}
+                if image_features is None:
+                    inputs["pixel_values"] = florence_pixel_values(image)
             except Exception as e:
                 logger.error(f"Processor execution failed: {e}")
                 return {task_prompt: f"Processor error: {str(e)}"}
-            
-            if not inputs:
-                logger.error("Florence processor returned empty output")
-                return {task_prompt: "Error: Processor returned nothing"}
-            
-            # Move all tensors to the device robustly using the correct dtype
-            inputs = inputs.to(device, dtype)
-            
+
             # Log processed inputs
             logger.info(f"Florence processed inputs keys: {list(inputs.keys())}")
-            
-            if "pixel_values" not in inputs:
-                logger.error("pixel_values missing from processor output")
-                return {task_prompt: "Error: No image data processed"}
 
-            # Safe generation
+            # Batched with any concurrent requests; the batcher owns generate() and batch_decode()
             try:
-                # Use ONLY input_ids and pixel_values as per official example
-                # and definitively disable KV caching to avoid NoneType errors
-                generated_ids = florence_model.generate(
-                    input_ids=inputs["input_ids"],
-                    pixel_values=inputs["pixel_values"],
-                    max_new_tokens=512,
-                    num_beams=3,
-                    do_sample=False,
-                    use_cache=False
-                )
+                if image_features is None:
+                    image_features = await asyncio.get_running_loop().run_in_executor(
+                        florence_executor, florence_encode_image, inputs["pixel_values"]
+                    )
+                    if cache_key is not None:
+                        put_florence_features(cache_key, image_features)
+                generated_text = await run_florence(inputs["input_ids"], image_features, task_prompt)
+                logger.info(f"Florence Raw Output: {generated_text}")
             except Exception as e:
                 logger.error(f"Model generation failed: {e}")
                 import traceback
                 logger.error(traceback.format_exc())
                 return {task_prompt: f"Generation error: {str(e)}"}
             
-            # Decode output
-            try:
-                generated_text = florence_processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
-                logger.info(f"Florence Raw Output: {generated_text}")
-            except Exception as e:
-                logger.error(f"Decoding failed: {e}")
-                return {task_prompt: f"Decoding error: {str(e)}"}
-            
             if not generated_text:
                 return {task_prompt: "No response generated"}
             
             # Post-processing depends on the task
-            # For VQA, we just want the text. For captions, we can use post_process_generation
-            if task_prompt in ["<CAPTION>", "<DETAILED_CAPTION>", "<MORE_DETAILED_CAPTION>"]:
+            # Only region/box tasks need post_process_generation's parser; for
+            # captions and VQA it would just strip special tokens, which the
+            # batcher's batch_decode already did for non-structured tasks
+            if task_prompt in FLORENCE_STRUCTURED_TASKS:
                 try:
                     parsed_answer = florence_processor.post_process_generation(
                         generated_text, 
                         task=task_prompt, 
-                        image_size=(image.width, image.height)
+                        image_size=image_size
                     )
                 except Exception as pe:
                     logger.warning(f"Post-processing failed: {pe}")
                     parsed_answer = {task_prompt: generated_text}
             else:
-                # Standard text output for VQA etc.
-                parsed_answer = {task_prompt: generated_text}
+                # Plain text output for captions, VQA etc.
+                parsed_answer = {task_prompt: generated_text.strip()}
 
+            if result_key is not None:
+                put_florence_result(result_key, parsed_answer)
             return parsed_answer
             
     except Exception as e:
@@ -3,8 +3,7 @@
 Test script for Ultralytics YOLO Detection API
 """
 
-import requests
-import base64
+import httpx
 import json
 from PIL import Image
 import io
@@ -13,73 +12,75 @@ def test_api():
     """Test the YOLO API endpoints"""
 
     base_url = "http://localhost:8001"
+    # Keep-alive connection reused by every request below
+    with httpx.Client(base_url=base_url, timeout=30) as client:
 
-    print("🧪 Testing Ultralytics YOLO API...")
+        print("🧪 Testing Ultralytics YOLO API...")
 
-    # Test 1: Health check
-    try:
-        response = requests.get(f"{base_url}/")
-        if response.status_code == 200:
-            print("✅ Health check passed")
-        else:
-            print(f"❌ Health check failed: {response.status_code}")
+        # Test 1: Health check
+        try:
+            response = client.get("/")
+            if response.status_code == 200:
+                print("✅ Health check passed")
+            else:
+                print(f"❌ Health check failed: {response.status_code}")
+                return False
+        except Exception as e:
+            print(f"❌ Health check failed: {e}")
             return False
-    except Exception as e:
-        print(f"❌ Health check failed: {e}")
-        return False
 
-    # Test 2: Status check
-    try:
-        response = requests.get(f"{base_url}/api/status")
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Status check passed: {data.get('status')}")
-        else:
-            print(f"❌ Status check failed: {response.status_code}")
+        # Test 2: Status check
+        try:
+            response = client.get("/api/status")
+            if response.status_code == 200:
+                data = response.json()
+                print(f"✅ Status check passed: {data.get('status')}")
+            else:
+                print(f"❌ Status check failed: {response.status_code}")
+                return False
+        except Exception as e:
+            print(f"❌ Status check failed: {e}")
             return False
-    except Exception as e:
-        print(f"❌ Status check failed: {e}")
-        return False
 
-    # Test 3: Test with a sample image
-    try:
-        # Load a sample image
-        image_path = "images/test.jpg"
-        with open(image_path, "rb") as f:
-            image_data = f.read()
+        # Test 3: Test with a sample image
+        try:
+            # Load a sample image
+            image_path = "images/test.jpg"
 
-        # Convert to base64
-        base64_image = base64.b64encode(image_data).decode()
+            # Make detection request, uploading the raw bytes as multipart/form-data
+            with open(image_path, "rb") as f:
+                response = client.post(
+                    "/api/detect-bin",
+                    files={"file": ("test.jpg", f, "image/jpeg")}
+                )
 
-        # Make detection request
-        request_data = {"image": base64_image}
-        response = requests.post(
-            f"{base_url}/api/detect-base64",
-            json=request_data,
-            headers={"Content-Type": "application/json"}
-        )
+            if response.status_code == 200:
+                data = response.json()
+                objects_found = data.get("total_objects", 0)
 
-        if response.status_code == 200:
-            data = response.json()
-            objects_found = data.get("total_objects", 0)
-            print(f"✅ Detection test passed: {objects_found} objects found")
+                # The extension reads type and x/y/width/height from every object
+                missing = [obj for obj in data.get("data", []) if "type" not in obj or "x" not in obj]
+                if missing:
+                    print(f"❌ Detection test failed: objects missing type/x fields: {missing[:3]}")
+                    return False
+                print(f"✅ Detection test passed: {objects_found} objects found")
 
-            # Show detected objects
-            if data.get("data"):
-                for obj in data["data"][:3]:  # Show first 3 objects
-                    print(f"   - {obj.get('type')} at ({obj.get('x')}, {obj.get('y')}) with {obj.get('confidence')*100}% confidence")
+                # Show detected objects
+                if data.get("data"):
+                    for obj in data["data"][:3]:  # Show first 3 objects
+                        print(f"   - {obj.get('type')} at ({obj.get('x')}, {obj.get('y')}) with {obj.get('confidence')*100}% confidence")
 
-        else:
-            print(f"❌ Detection test failed: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return False
+            else:
+                print(f"❌ Detection test failed: {response.status_code}")
+                print(f"   Response: {response.text}")
+                return False
 
-    except Exception as e:
-        print(f"❌ Detection test failed: {e}")
-        return False
+        except Exception as e:
+            print(f"❌ Detection test failed: {e}")
+            return False
 
-    print("🎉 All tests passed! The API is working correctly.")
-    return True
+        print("🎉 All tests passed! The API is working correctly.")
+        return True
 
 if __name__ == "__main__":
     test_api()
@@ -1,52 +1,69 @@
 #!/usr/bin/env python3
-import requests
-import base64
+import httpx
+import pybase64
 import json
 import os
 from pathlib import Path
 
 def test_florence():
     base_url = "http://localhost:8001"
+    # Keep-alive connection reused by every request below
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        # Find an image in the images directory
+        images_dir = Path("images")
+        image_files = list(images_dir.glob("*.jpg")) + list(images_dir.glob("*.png"))
     
-    # Find an image in the images directory
-    images_dir = Path("images")
-    image_files = list(images_dir.glob("*.jpg")) + list(images_dir.glob("*.png"))
-    
-    if not image_files:
-        print("❌ No images found in images/ directory for testing.")
-        return False
+        if not image_files:
+            print("❌ No images found in images/ directory for testing.")
+            return False
     
-    test_image_path = image_files[0]
-    print(f"🧪 Testing Florence-2 with {test_image_path}...")
+        test_image_path = image_files[0]
+        print(f"🧪 Testing Florence-2 with {test_image_path}...")
     
-    try:
-        with open(test_image_path, "rb") as f:
-            image_data = f.read()
+        try:
+            with open(test_image_path, "rb") as f:
+                image_data = f.read()
         
-        base64_image = base64.b64encode(image_data).decode()
+            base64_image = pybase64.b64encode_as_string(image_data)
         
-        # Test 1: Analyze a box (full image for simplicity)
-        payload = {
-            "image": base64_image,
-            "box": {"x": 0, "y": 0, "width": 100, "height": 100},
-            "type": "car"
-        }
+            # Test 1: Analyze a box (full image for simplicity)
+            payload = {
+                "image": base64_image,
+                "box": {"x": 0, "y": 0, "width": 100, "height": 100},
+                "type": "car"
+            }
         
-        print("📡 Sending request to /api/analyze-box...")
-        response = requests.post(f"{base_url}/api/analyze-box", json=payload)
+            print("📡 Sending request to /api/analyze-box...")
+            response = client.post("/api/analyze-box", json=payload)
         
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Florence Analysis Result: {data.get('analysis')}")
-            return True
-        else:
-            print(f"❌ Florence test failed: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return False
+            if response.status_code == 200:
+                data = response.json()
+                print(f"✅ Florence Analysis Result: {data.get('analysis')}")
+            else:
+                print(f"❌ Florence test failed: {response.status_code}")
+                print(f"   Response: {response.text}")
+                return False
+
+            # Test 2: Same box through the multipart endpoint (raw bytes, no base64)
+            print("📡 Sending request to /api/analyze-box-bin...")
+            response = client.post(
+                "/api/analyze-box-bin",
+                files={"file": (test_image_path.name, image_data)},
+                data={"box": json.dumps(payload["box"]), "type": payload["type"]}
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                print(f"✅ Florence Analysis Result (multipart): {data.get('analysis')}")
+                return True
+            else:
+                print(f"❌ Florence multipart test failed: {response.status_code}")
+                print(f"   Response: {response.text}")
+                return False
             
-    except Exception as e:
-        print(f"❌ Florence test failed: {e}")
-        return False
+        except Exception as e:
+            print(f"❌ Florence test failed: {e}")
+            return False
 
 if __name__ == "__main__":
     test_florence()